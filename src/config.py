@@ -4,51 +4,83 @@ Contains all settings, constants, and configuration parameters
 """
 
 import os
+import time
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
+from functools import lru_cache
+from types import MappingProxyType
 
-# Load environment variables
-load_dotenv()
+@lru_cache(maxsize=1)
+def _load_env():
+    """Read .env on first use instead of at import time"""
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # Database Configuration
-DATABASE_CONFIG = {
-    'dsn': os.getenv('PG_DSN'),
-    'pool_size': 10,
-    'max_overflow': 20,
-    'pool_timeout': 30,
-    'pool_recycle': 3600
-}
+@lru_cache(maxsize=1)
+def database_config():
+    """
+    Get database settings, loading credentials from the environment on first call
+    
+    Returns:
+        dict: Database connection configuration
+    """
+    _load_env()
+    return {
+        'dsn': os.getenv('PG_DSN'),
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_timeout': 30,
+        'pool_recycle': 3600
+    }
 
 # API Configuration
-API_CONFIG = {
-    'fred_api_key': os.getenv('FRED_API_KEY'),
-    'news_api_key': os.getenv('NEWS_API_KEY'),
-    'rate_limit_delay': 1,  # seconds between API calls
-    'max_retries': 3,
-    'timeout': 30
-}
+@lru_cache(maxsize=1)
+def api_config():
+    """
+    Get external API settings, loading keys from the environment on first call
+    
+    Returns:
+        dict: API configuration
+    """
+    _load_env()
+    return {
+        'fred_api_key': os.getenv('FRED_API_KEY'),
+        'news_api_key': os.getenv('NEWS_API_KEY'),
+        'rate_limit_delay': 1,  # seconds between API calls
+        'max_retries': 3,
+        'timeout': 30
+    }
 
 # Data Sources Configuration
+def _all_of(groups):
+    """Ordered, de-duplicated union of every category in a grouping"""
+    return tuple(dict.fromkeys(item for group in groups.values() for item in group))
+
 SYMBOLS = {
     'indices': ['SPY', 'QQQ', 'IWM', 'EFA', 'VTI'],
     'sectors': ['XLF', 'XLK', 'XLE', 'XLI', 'XLV', 'XLY', 'XLP', 'XLU', 'XLB', 'XLRE'],
-    'volatility': ['VIX'],
-    'all': ['SPY', 'QQQ', 'IWM', 'EFA', 'VTI', 'XLF', 'XLK', 'XLE', 'XLI', 'XLV', 
-            'XLY', 'XLP', 'XLU', 'XLB', 'XLRE', 'VIX']
+    'volatility': ['VIX']
 }
+SYMBOLS['all'] = _all_of(SYMBOLS)
+SYMBOLS_MEMBERSHIP = frozenset(SYMBOLS['all'])
 
 MACRO_INDICATORS = {
-    'inflation': ['CPIAUCSL', 'CPILFESL'],
-    'employment': ['UNRATE', 'PAYEMS', 'JOBOPENINGS'],
+    'inflation': ['CPIAUCSL'],
+    'employment': ['UNRATE', 'PAYEMS'],
     'interest_rates': ['FEDFUNDS', 'DGS10', 'DGS2', 'DGS30'],
-    'sentiment': ['UMCSENT', 'UMCSENT1'],
+    'sentiment': ['UMCSENT'],
     'economic_activity': ['GDP', 'INDPRO', 'RETAILSALES'],
     'housing': ['HOUSINGSTARTS', 'CSUSHPISA'],
-    'money_supply': ['M2SL', 'M1SL'],
-    'all': ['CPIAUCSL', 'UNRATE', 'FEDFUNDS', 'UMCSENT', 'DGS10', 'DGS2', 'DGS30',
-            'GDP', 'PAYEMS', 'INDPRO', 'RETAILSALES', 'HOUSINGSTARTS', 'DURABLE',
-            'CAPACITY', 'M2SL', 'TOTALSA', 'CSUSHPISA', 'RECPROUSM156N', 'T10Y2Y', 'T10Y3M']
+    'money_supply': ['M2SL'],
+    # Loaded series without a category of their own
+    'other': ['DURABLE', 'CAPACITY', 'TOTALSA', 'RECPROUSM156N', 'T10Y2Y', 'T10Y3M']
 }
+MACRO_INDICATORS['all'] = _all_of(MACRO_INDICATORS)
+MACRO_INDICATORS_MEMBERSHIP = frozenset(MACRO_INDICATORS['all'])
 
 TRENDS_KEYWORDS = {
     'market_sentiment': [
@@ -65,15 +97,10 @@ TRENDS_KEYWORDS = {
     ],
     'events': [
         'earnings season', 'fed meeting', 'jobs report', 'cpi report', 'market correction'
-    ],
-    'all': [
-        'stock market crash', 'recession', 'inflation', 'bear market', 'bull market',
-        'buy stocks', 'sell stocks', 'stock market news', 'market volatility', 'fed interest rates',
-        'unemployment', 'gdp growth', 'consumer spending', 'housing market', 'oil prices',
-        'tech stocks', 'banking stocks', 'energy stocks', 'healthcare stocks', 'crypto',
-        'earnings season', 'fed meeting', 'jobs report', 'cpi report', 'market correction'
     ]
 }
+TRENDS_KEYWORDS['all'] = _all_of(TRENDS_KEYWORDS)
+TRENDS_KEYWORDS_MEMBERSHIP = frozenset(TRENDS_KEYWORDS['all'])
 
 # ETL Configuration
 ETL_CONFIG = {
@@ -165,6 +192,39 @@ LOGGING_CONFIG = {
     }
 }
 
+@lru_cache(maxsize=1)
+def get_performance_logger():
+    """
+    Get the performance logger
+    
+    Records are only enqueued on the calling thread; a background
+    QueueListener formats them and writes the rotating performance log,
+    keeping disk I/O off the ETL hot path.
+    
+    Returns:
+        logging.Logger: Logger writing to the performance log file
+    """
+    log_file = LOGGING_CONFIG['log_files']['performance']
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=LOGGING_CONFIG['file_rotation']['max_bytes'],
+        backupCount=LOGGING_CONFIG['file_rotation']['backup_count']
+    )
+    file_handler.setFormatter(logging.Formatter(LOGGING_CONFIG['format']))
+    
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    perf_logger = logging.getLogger('performance')
+    perf_logger.setLevel(LOGGING_CONFIG['level'])
+    perf_logger.addHandler(QueueHandler(log_queue))
+    perf_logger.propagate = False
+    return perf_logger
+
 # Data Quality Configuration
 DATA_QUALITY_CONFIG = {
     'price_data': {
@@ -230,67 +290,83 @@ PERFORMANCE_CONFIG = {
     }
 }
 
+def _minute_of_day(hhmm):
+    """Convert an 'HH:MM' string to minutes past midnight"""
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+# Market calendar resolved once at import
+_HOLIDAY_DATES = frozenset(datetime.strptime(d, '%Y-%m-%d').date() for d in MARKET_HOURS['holidays'])
+_MARKET_OPEN_MINUTE = _minute_of_day(MARKET_HOURS['open_time'])
+_MARKET_CLOSE_MINUTE = _minute_of_day(MARKET_HOURS['close_time'])
+
 def get_market_status():
     """
     Get current market status (Open/Closed)
     
+    The result is cached for one second, so repeated calls from the
+    scheduler or dashboard within the same second share one computation.
+    
     Returns:
         str: 'Open' or 'Closed'
     """
+    return _market_status_for_second(int(time.monotonic()))
+
+@lru_cache(maxsize=1)
+def _market_status_for_second(second):
+    """Compute market status; `second` only serves as the cache key"""
     now = datetime.now()
     
-    # Check if it's a weekend
-    if now.weekday() >= 5:
-        return 'Closed'
-    
-    # Check if it's a holiday
-    date_str = now.strftime('%Y-%m-%d')
-    if date_str in MARKET_HOURS['holidays']:
+    # Weekends and holidays
+    if now.weekday() >= 5 or now.date() in _HOLIDAY_DATES:
         return 'Closed'
     
     # Check market hours (simplified - assumes ET timezone)
-    market_open = now.replace(hour=9, minute=30, second=0, microsecond=0)
-    market_close = now.replace(hour=16, minute=0, second=0, microsecond=0)
-    
-    if market_open <= now <= market_close:
+    minute_of_day = now.hour * 60 + now.minute
+    if _MARKET_OPEN_MINUTE <= minute_of_day <= _MARKET_CLOSE_MINUTE:
         return 'Open'
     else:
         return 'Closed'
 
+# Read-only so callers cannot mutate the shared mappings
+_DATA_RETENTION_DAYS = MappingProxyType({
+    'price_data': 365 * 2,  # 2 years
+    'macro_data': 365 * 5,  # 5 years
+    'trends_data': 365,  # 1 year
+    'news_data': 90  # 3 months
+})
+
+_REFRESH_SCHEDULE_OPEN = MappingProxyType({
+    'price_data': 30,  # minutes
+    'macro_data': 1440,  # daily
+    'trends_data': 1440,  # daily
+    'news_data': 60  # hourly
+})
+
+_REFRESH_SCHEDULE_CLOSED = MappingProxyType({
+    'price_data': 1440,  # daily
+    'macro_data': 1440,  # daily
+    'trends_data': 10080,  # weekly
+    'news_data': 1440  # daily
+})
+
 def get_data_retention_days():
     """
     Get data retention period in days
     
     Returns:
-        int: Number of days to retain data
+        Mapping: Number of days to retain data, per data type (read-only)
     """
-    return {
-        'price_data': 365 * 2,  # 2 years
-        'macro_data': 365 * 5,  # 5 years
-        'trends_data': 365,  # 1 year
-        'news_data': 90  # 3 months
-    }
+    return _DATA_RETENTION_DAYS
 
 def get_refresh_schedule():
     """
     Get refresh schedule based on market status
     
     Returns:
-        dict: Refresh schedule configuration
+        Mapping: Refresh schedule configuration (read-only)
     """
-    market_status = get_market_status()
-    
-    if market_status == 'Open':
-        return {
-            'price_data': 30,  # minutes
-            'macro_data': 1440,  # daily
-            'trends_data': 1440,  # daily
-            'news_data': 60  # hourly
-        }
+    if get_market_status() == 'Open':
+        return _REFRESH_SCHEDULE_OPEN
     else:
-        return {
-            'price_data': 1440,  # daily
-            'macro_data': 1440,  # daily
-            'trends_data': 10080,  # weekly
-            'news_data': 1440  # daily
-        }
+        return _REFRESH_SCHEDULE_CLOSED
@@ -3,32 +3,209 @@ Data validation and quality checks for the ETL pipeline
 Ensures data integrity and identifies issues early
 """
 
+import time
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from src.config import DATA_QUALITY_CONFIG
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+if NUMBA_AVAILABLE:
+    # fastmath is deliberately off: it assumes no NaNs and would drop the x == x checks
+    @njit(parallel=True, cache=True)
+    def _ohlc_bad(o, h, l, c):
+        """Count complete bars violating low <= open/close <= high in one fused pass"""
+        n = o.shape[0]
+        bad = 0
+        for i in prange(n):
+            oi, hi, li, ci = o[i], h[i], l[i], c[i]
+            if oi == oi and hi == hi and li == li and ci == ci:
+                if not (li <= oi <= hi and li <= ci <= hi):
+                    bad += 1
+        return bad
+
+@dataclass(frozen=True)
+class ValidationSpec:
+    """Declarative description of the checks applied to one data type"""
+    required: frozenset
+    max_null_pct: float
+    range_checks: Tuple[Tuple[str, str, str, float, float], ...] = ()  # (column, label, stat, min, max)
+    extra: Tuple[Callable[[pd.DataFrame, Dict], None], ...] = ()
+    unique_column: Optional[str] = None
+    unique_stat: Optional[str] = None
+    duplicate_key: Tuple[str, ...] = ()
+
+def _as_dt(series: pd.Series) -> pd.Series:
+    """Return the series as datetimes, skipping the parse when it already is one"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, cache=True)
+
+def _nan_min_max(series: pd.Series) -> Optional[Tuple[float, float]]:
+    """
+    Min and max ignoring nulls, straight off the underlying array
+    
+    Avoids the dropna() copy; np.fmin/np.fmax skip NaN without warning.
+    Returns None when every value is null.
+    """
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    min_value = np.fmin.reduce(values)
+    if np.isnan(min_value):
+        return None
+    return min_value, np.fmax.reduce(values)
+
+def _check_price_bounds(df: pd.DataFrame, results: Dict) -> None:
+    """Close prices must fall within the configured hard thresholds"""
+    config = DATA_QUALITY_CONFIG['price_data']
+    if 'close' not in df.columns:
+        return
+    
+    bounds = _nan_min_max(df['close'])
+    if bounds is not None:
+        min_price, max_price = bounds
+        
+        if min_price < config['min_price']:
+            results['valid'] = False
+            results['issues'].append(f"Minimum price {min_price} below threshold {config['min_price']}")
+        
+        if max_price > config['max_price']:
+            results['valid'] = False
+            results['issues'].append(f"Maximum price {max_price} above threshold {config['max_price']}")
+        
+        results['stats']['price_range'] = {'min': min_price, 'max': max_price}
+
+def _check_date_range(df: pd.DataFrame, results: Dict) -> None:
+    """Record the covered date span"""
+    if 'date' in df.columns:
+        start, end = _as_dt(df['date']).agg(['min', 'max'])
+        results['stats']['date_range'] = {
+            'start': start,
+            'end': end,
+            'days': (end - start).days
+        }
+
+def _check_ohlc(df: pd.DataFrame, results: Dict) -> None:
+    """Count bars where open/close fall outside the low-high range"""
+    if all(col in df.columns for col in ['open', 'high', 'low', 'close']):
+        o, h, l, c = (np.ascontiguousarray(df[col].to_numpy(dtype=np.float64, na_value=np.nan)) for col in ['open', 'high', 'low', 'close'])
+        if NUMBA_AVAILABLE:
+            ohlc_issues = int(_ohlc_bad(o, h, l, c))
+        elif NUMEXPR_AVAILABLE:
+            # Single fused, multi-threaded pass; x == x is False only for NaN
+            bad_mask = ne.evaluate(
+                '(o == o) & (h == h) & (l == l) & (c == c) & ~((l <= o) & (o <= h) & (l <= c) & (c <= h))',
+                local_dict={'o': o, 'h': h, 'l': l, 'c': c}
+            )
+            ohlc_issues = int(np.count_nonzero(bad_mask))
+        else:
+            valid_mask = (l <= o) & (o <= h) & (l <= c) & (c <= h)
+            notna_mask = ~(np.isnan(o) | np.isnan(h) | np.isnan(l) | np.isnan(c))
+            ohlc_issues = int(np.count_nonzero(notna_mask & ~valid_mask))
+        
+        if ohlc_issues > 0:
+            results['warnings'].append(f"Found {ohlc_issues} OHLC consistency issues")
+
+def _check_indicator_ranges(df: pd.DataFrame, results: Dict) -> None:
+    """Check value ranges for specific macro indicators"""
+    config = DATA_QUALITY_CONFIG['macro_data']
+    if 'indicator_id' in df.columns and 'value' in df.columns:
+        # One grouped pass instead of a boolean mask per configured indicator
+        bounds = df.groupby('indicator_id', observed=True)['value'].agg(['min', 'max'])
+        for indicator, (min_val, max_val) in config['value_range'].items():
+            if indicator not in bounds.index:
+                continue
+            indicator_min, indicator_max = bounds.at[indicator, 'min'], bounds.at[indicator, 'max']
+            if indicator_min < min_val or indicator_max > max_val:
+                results['warnings'].append(f"Indicator {indicator} values outside expected range [{min_val}, {max_val}]")
+
+def _average_sentiment(df: pd.DataFrame, results: Dict) -> None:
+    """Record mean compound sentiment"""
+    if 'vader_compound' in df.columns:
+        values = df['vader_compound'].to_numpy(dtype=np.float64, na_value=np.nan)
+        if not np.isnan(values).all():
+            results['stats']['avg_sentiment'] = np.nanmean(values)
+
+def _count_duplicates(df: pd.DataFrame, key: Tuple[str, ...]) -> int:
+    """Count repeated rows by hashing the key columns (all columns if the key is unavailable)"""
+    subset = df[list(key)] if key and all(col in df.columns for col in key) else df
+    row_hashes = pd.util.hash_pandas_object(subset, index=False).to_numpy()
+    return int(row_hashes.size - np.unique(row_hashes).size)
+
+def _build_spec(data_type: str, **kwargs) -> ValidationSpec:
+    config = DATA_QUALITY_CONFIG[data_type]
+    return ValidationSpec(
+        required=frozenset(config['required_columns']),
+        max_null_pct=config['max_null_percentage'],
+        **kwargs
+    )
+
+# One spec per data type, resolved once at import
+VALIDATION_SPECS = {
+    'price_data': _build_spec(
+        'price_data',
+        duplicate_key=('symbol', 'date'),
+        extra=(_check_price_bounds, _check_date_range, _check_ohlc),
+        unique_column='symbol',
+        unique_stat='unique_symbols'
+    ),
+    'macro_data': _build_spec(
+        'macro_data',
+        duplicate_key=('indicator_id', 'date'),
+        extra=(_check_indicator_ranges,),
+        unique_column='indicator_id',
+        unique_stat='unique_indicators'
+    ),
+    'trends_data': _build_spec(
+        'trends_data',
+        duplicate_key=('keyword', 'date', 'geo'),
+        range_checks=(('score', 'Score', 'score_range', *DATA_QUALITY_CONFIG['trends_data']['score_range']),),
+        unique_column='keyword',
+        unique_stat='unique_keywords'
+    ),
+    'news_data': _build_spec(
+        'news_data',
+        duplicate_key=('symbol', 'fetched_at', 'title'),
+        range_checks=(('vader_compound', 'Sentiment', 'sentiment_range', *DATA_QUALITY_CONFIG['news_data']['sentiment_range']),),
+        extra=(_average_sentiment,),
+        unique_column='symbol',
+        unique_stat='unique_symbols'
+    ),
+}
+
 class DataValidator:
     """Data validation and quality assurance"""
     
     def __init__(self):
         self.validation_results = {}
     
-    def validate_price_data(self, df: pd.DataFrame) -> Dict:
+    def _validate(self, df: pd.DataFrame, spec: ValidationSpec) -> Dict:
         """
-        Validate stock price data
+        Run the checks described by a validation spec
         
         Args:
-            df: Price data DataFrame
+            df: DataFrame to validate
+            spec: Checks to apply
         
         Returns:
             Validation results dictionary
         """
-        config = DATA_QUALITY_CONFIG['price_data']
         results = {
             'valid': True,
             'issues': [],
@@ -37,10 +214,10 @@ class DataValidator:
         }
         
         # Check required columns
-        missing_cols = [col for col in config['required_columns'] if col not in df.columns]
+        missing_cols = spec.required - frozenset(df.columns)
         if missing_cols:
             results['valid'] = False
-            results['issues'].append(f"Missing required columns: {missing_cols}")
+            results['issues'].append(f"Missing required columns: {sorted(missing_cols)}")
         
         if df.empty:
             results['valid'] = False
@@ -48,250 +225,63 @@ class DataValidator:
             return results
         
         # Check for null values
-        null_counts = df.isnull().sum()
         total_rows = len(df)
+        null_pct = df.isna().mean(axis=0).to_numpy() * 100.0
+        over = null_pct > spec.max_null_pct
+        warn = (null_pct > 0) & ~over
+        cols = df.columns.to_numpy()
+        
+        # Only offending columns are visited in Python
+        for col, null_percentage in zip(cols[over], null_pct[over]):
+            results['issues'].append(f"Column {col} has {null_percentage:.1f}% null values")
+        for col, null_percentage in zip(cols[warn], null_pct[warn]):
+            results['warnings'].append(f"Column {col} has {null_percentage:.1f}% null values")
+        if over.any():
+            results['valid'] = False
         
-        for col, null_count in null_counts.items():
-            null_percentage = (null_count / total_rows) * 100
-            if null_percentage > config['max_null_percentage']:
-                results['valid'] = False
-                results['issues'].append(f"Column {col} has {null_percentage:.1f}% null values")
-            elif null_percentage > 0:
-                results['warnings'].append(f"Column {col} has {null_percentage:.1f}% null values")
-        
-        # Check price ranges
-        if 'close' in df.columns:
-            close_prices = df['close'].dropna()
-            if len(close_prices) > 0:
-                min_price = close_prices.min()
-                max_price = close_prices.max()
+        # Check soft value ranges
+        for col, label, stat, min_val, max_val in spec.range_checks:
+            if col not in df.columns:
+                continue
+            bounds = _nan_min_max(df[col])
+            if bounds is not None:
+                min_value, max_value = bounds
                 
-                if min_price < config['min_price']:
-                    results['valid'] = False
-                    results['issues'].append(f"Minimum price {min_price} below threshold {config['min_price']}")
+                if min_value < min_val or max_value > max_val:
+                    results['warnings'].append(f"{label} values outside expected range [{min_val}, {max_val}]: [{min_value}, {max_value}]")
                 
-                if max_price > config['max_price']:
-                    results['valid'] = False
-                    results['issues'].append(f"Maximum price {max_price} above threshold {config['max_price']}")
-                
-                results['stats']['price_range'] = {'min': min_price, 'max': max_price}
+                results['stats'][stat] = {'min': min_value, 'max': max_value}
         
-        # Check for duplicate rows
-        duplicates = df.duplicated().sum()
+        # Check for duplicate rows (on the natural key when present)
+        duplicates = _count_duplicates(df, spec.duplicate_key)
         if duplicates > 0:
             results['warnings'].append(f"Found {duplicates} duplicate rows")
         
-        # Check date consistency
-        if 'date' in df.columns:
-            dates = pd.to_datetime(df['date'])
-            date_range = dates.max() - dates.min()
-            results['stats']['date_range'] = {
-                'start': dates.min(),
-                'end': dates.max(),
-                'days': date_range.days
-            }
-        
-        # Check OHLC consistency
-        if all(col in df.columns for col in ['open', 'high', 'low', 'close']):
-            ohlc_issues = 0
-            for _, row in df.iterrows():
-                if pd.notna(row['open']) and pd.notna(row['high']) and pd.notna(row['low']) and pd.notna(row['close']):
-                    if not (row['low'] <= row['open'] <= row['high'] and row['low'] <= row['close'] <= row['high']):
-                        ohlc_issues += 1
-            
-            if ohlc_issues > 0:
-                results['warnings'].append(f"Found {ohlc_issues} OHLC consistency issues")
+        # Data-type specific checks
+        for check in spec.extra:
+            check(df, results)
         
         results['stats']['total_rows'] = total_rows
-        results['stats']['unique_symbols'] = df['symbol'].nunique() if 'symbol' in df.columns else 0
+        if spec.unique_stat:
+            results['stats'][spec.unique_stat] = df[spec.unique_column].nunique() if spec.unique_column in df.columns else 0
         
         return results
     
+    def validate_price_data(self, df: pd.DataFrame) -> Dict:
+        """Validate stock price data"""
+        return self._validate(df, VALIDATION_SPECS['price_data'])
+    
     def validate_macro_data(self, df: pd.DataFrame) -> Dict:
-        """
-        Validate macroeconomic data
-        
-        Args:
-            df: Macro data DataFrame
-        
-        Returns:
-            Validation results dictionary
-        """
-        config = DATA_QUALITY_CONFIG['macro_data']
-        results = {
-            'valid': True,
-            'issues': [],
-            'warnings': [],
-            'stats': {}
-        }
-        
-        # Check required columns
-        missing_cols = [col for col in config['required_columns'] if col not in df.columns]
-        if missing_cols:
-            results['valid'] = False
-            results['issues'].append(f"Missing required columns: {missing_cols}")
-        
-        if df.empty:
-            results['valid'] = False
-            results['issues'].append("DataFrame is empty")
-            return results
-        
-        # Check for null values
-        null_counts = df.isnull().sum()
-        total_rows = len(df)
-        
-        for col, null_count in null_counts.items():
-            null_percentage = (null_count / total_rows) * 100
-            if null_percentage > config['max_null_percentage']:
-                results['valid'] = False
-                results['issues'].append(f"Column {col} has {null_percentage:.1f}% null values")
-            elif null_percentage > 0:
-                results['warnings'].append(f"Column {col} has {null_percentage:.1f}% null values")
-        
-        # Check value ranges for specific indicators
-        if 'indicator_id' in df.columns and 'value' in df.columns:
-            for indicator, (min_val, max_val) in config['value_range'].items():
-                indicator_data = df[df['indicator_id'] == indicator]['value'].dropna()
-                if len(indicator_data) > 0:
-                    if indicator_data.min() < min_val or indicator_data.max() > max_val:
-                        results['warnings'].append(f"Indicator {indicator} values outside expected range [{min_val}, {max_val}]")
-        
-        # Check for duplicate rows
-        duplicates = df.duplicated().sum()
-        if duplicates > 0:
-            results['warnings'].append(f"Found {duplicates} duplicate rows")
-        
-        results['stats']['total_rows'] = total_rows
-        results['stats']['unique_indicators'] = df['indicator_id'].nunique() if 'indicator_id' in df.columns else 0
-        
-        return results
+        """Validate macroeconomic data"""
+        return self._validate(df, VALIDATION_SPECS['macro_data'])
     
     def validate_trends_data(self, df: pd.DataFrame) -> Dict:
-        """
-        Validate Google Trends data
-        
-        Args:
-            df: Trends data DataFrame
-        
-        Returns:
-            Validation results dictionary
-        """
-        config = DATA_QUALITY_CONFIG['trends_data']
-        results = {
-            'valid': True,
-            'issues': [],
-            'warnings': [],
-            'stats': {}
-        }
-        
-        # Check required columns
-        missing_cols = [col for col in config['required_columns'] if col not in df.columns]
-        if missing_cols:
-            results['valid'] = False
-            results['issues'].append(f"Missing required columns: {missing_cols}")
-        
-        if df.empty:
-            results['valid'] = False
-            results['issues'].append("DataFrame is empty")
-            return results
-        
-        # Check for null values
-        null_counts = df.isnull().sum()
-        total_rows = len(df)
-        
-        for col, null_count in null_counts.items():
-            null_percentage = (null_count / total_rows) * 100
-            if null_percentage > config['max_null_percentage']:
-                results['valid'] = False
-                results['issues'].append(f"Column {col} has {null_percentage:.1f}% null values")
-            elif null_percentage > 0:
-                results['warnings'].append(f"Column {col} has {null_percentage:.1f}% null values")
-        
-        # Check score ranges
-        if 'score' in df.columns:
-            scores = df['score'].dropna()
-            if len(scores) > 0:
-                min_score = scores.min()
-                max_score = scores.max()
-                
-                if min_score < 0 or max_score > 100:
-                    results['warnings'].append(f"Score values outside expected range [0, 100]: [{min_score}, {max_score}]")
-                
-                results['stats']['score_range'] = {'min': min_score, 'max': max_score}
-        
-        # Check for duplicate rows
-        duplicates = df.duplicated().sum()
-        if duplicates > 0:
-            results['warnings'].append(f"Found {duplicates} duplicate rows")
-        
-        results['stats']['total_rows'] = total_rows
-        results['stats']['unique_keywords'] = df['keyword'].nunique() if 'keyword' in df.columns else 0
-        
-        return results
+        """Validate Google Trends data"""
+        return self._validate(df, VALIDATION_SPECS['trends_data'])
     
     def validate_news_data(self, df: pd.DataFrame) -> Dict:
-        """
-        Validate news sentiment data
-        
-        Args:
-            df: News data DataFrame
-        
-        Returns:
-            Validation results dictionary
-        """
-        config = DATA_QUALITY_CONFIG['news_data']
-        results = {
-            'valid': True,
-            'issues': [],
-            'warnings': [],
-            'stats': {}
-        }
-        
-        # Check required columns
-        missing_cols = [col for col in config['required_columns'] if col not in df.columns]
-        if missing_cols:
-            results['valid'] = False
-            results['issues'].append(f"Missing required columns: {missing_cols}")
-        
-        if df.empty:
-            results['valid'] = False
-            results['issues'].append("DataFrame is empty")
-            return results
-        
-        # Check for null values
-        null_counts = df.isnull().sum()
-        total_rows = len(df)
-        
-        for col, null_count in null_counts.items():
-            null_percentage = (null_count / total_rows) * 100
-            if null_percentage > config['max_null_percentage']:
-                results['valid'] = False
-                results['issues'].append(f"Column {col} has {null_percentage:.1f}% null values")
-            elif null_percentage > 0:
-                results['warnings'].append(f"Column {col} has {null_percentage:.1f}% null values")
-        
-        # Check sentiment ranges
-        if 'vader_compound' in df.columns:
-            sentiments = df['vader_compound'].dropna()
-            if len(sentiments) > 0:
-                min_sentiment = sentiments.min()
-                max_sentiment = sentiments.max()
-                
-                if min_sentiment < -1 or max_sentiment > 1:
-                    results['warnings'].append(f"Sentiment values outside expected range [-1, 1]: [{min_sentiment}, {max_sentiment}]")
-                
-                results['stats']['sentiment_range'] = {'min': min_sentiment, 'max': max_sentiment}
-                results['stats']['avg_sentiment'] = sentiments.mean()
-        
-        # Check for duplicate rows
-        duplicates = df.duplicated().sum()
-        if duplicates > 0:
-            results['warnings'].append(f"Found {duplicates} duplicate rows")
-        
-        results['stats']['total_rows'] = total_rows
-        results['stats']['unique_symbols'] = df['symbol'].nunique() if 'symbol' in df.columns else 0
-        
-        return results
+        """Validate news sentiment data"""
+        return self._validate(df, VALIDATION_SPECS['news_data'])
     
     def validate_data_freshness(self, df: pd.DataFrame, max_age_hours: int = 24) -> Dict:
         """
@@ -325,24 +315,32 @@ class DataValidator:
             return results
         
         # Check data age
-        timestamps = pd.to_datetime(df[timestamp_col])
-        now = datetime.now()
+        timestamps = _as_dt(df[timestamp_col])
+        earliest, latest = timestamps.agg(['min', 'max'])
+        if pd.isna(latest):
+            results['warnings'].append("No valid timestamps")
+            return results
+        
+        # Work in epoch seconds; naive timestamps are local wall-clock time,
+        # so shift "now" by the local UTC offset to compare like with like
+        now_ts = time.time()
+        if latest.tz is None:
+            now_ts += time.localtime().tm_gmtoff
+        latest_ts = latest.value / 1e9
         
         if timestamp_col == 'date':
             # For date columns, check if data is recent
-            latest_date = timestamps.max()
-            days_old = (now.date() - latest_date.date()).days
+            days_old = int(now_ts // 86400 - latest_ts // 86400)
             if days_old > max_age_hours / 24:
                 results['warnings'].append(f"Latest data is {days_old} days old")
         else:
             # For datetime columns, check hours
-            latest_time = timestamps.max()
-            hours_old = (now - latest_time).total_seconds() / 3600
+            hours_old = (now_ts - latest_ts) / 3600
             if hours_old > max_age_hours:
                 results['warnings'].append(f"Latest data is {hours_old:.1f} hours old")
         
-        results['stats']['latest_timestamp'] = timestamps.max()
-        results['stats']['earliest_timestamp'] = timestamps.min()
+        results['stats']['latest_timestamp'] = latest
+        results['stats']['earliest_timestamp'] = earliest
         
         return results
     
@@ -356,37 +354,50 @@ class DataValidator:
         Returns:
             Formatted quality report string
         """
-        report = []
-        report.append("=" * 50)
-        report.append("DATA QUALITY REPORT")
-        report.append("=" * 50)
+        return "\n".join(self.iter_quality_report(validation_results))
+    
+    def iter_quality_report(self, validation_results: Dict) -> Iterator[str]:
+        """
+        Yield the quality report line by line
+        
+        Lets callers stream the report (e.g. to a file) without building
+        the full string first.
+        
+        Args:
+            validation_results: Dictionary of validation results
+        
+        Yields:
+            Report lines
+        """
+        yield "=" * 50
+        yield "DATA QUALITY REPORT"
+        yield "=" * 50
         
         for data_type, results in validation_results.items():
-            report.append(f"\n{data_type.upper()} DATA:")
-            report.append("-" * 20)
+            yield f"\n{data_type.upper()} DATA:"
+            yield "-" * 20
             
             if results['valid']:
-                report.append("✅ Status: VALID")
+                yield "✅ Status: VALID"
             else:
-                report.append("❌ Status: INVALID")
+                yield "❌ Status: INVALID"
             
             if results['issues']:
-                report.append("\n🚨 Issues:")
+                yield "\n🚨 Issues:"
                 for issue in results['issues']:
-                    report.append(f"  - {issue}")
+                    yield f"  - {issue}"
             
             if results['warnings']:
-                report.append("\n⚠️  Warnings:")
+                yield "\n⚠️  Warnings:"
                 for warning in results['warnings']:
-                    report.append(f"  - {warning}")
+                    yield f"  - {warning}"
             
             if results['stats']:
-                report.append("\n📊 Statistics:")
+                yield "\n📊 Statistics:"
                 for stat, value in results['stats'].items():
-                    report.append(f"  - {stat}: {value}")
+                    yield f"  - {stat}: {value}"
         
-        report.append("\n" + "=" * 50)
-        return "\n".join(report)
+        yield "\n" + "=" * 50
 
 def run_data_quality_checks(price_df: pd.DataFrame = None, 
                            macro_df: pd.DataFrame = None,
@@ -395,6 +406,11 @@ def run_data_quality_checks(price_df: pd.DataFrame = None,
     """
     Run comprehensive data quality checks
     
+    Frames may use pyarrow-backed dtypes (e.g. from
+    ``pd.read_sql(..., dtype_backend='pyarrow')``); null counts, nunique and
+    min/max then run on Arrow's columnar kernels, and pd.NA is treated as NaN
+    where NumPy arrays are needed.
+    
     Args:
         price_df: Price data DataFrame
         macro_df: Macro data DataFrame
@@ -405,26 +421,33 @@ def run_data_quality_checks(price_df: pd.DataFrame = None,
         Dictionary with all validation results
     """
     validator = DataValidator()
-    results = {}
-    
-    if price_df is not None:
-        logger.info("Validating price data...")
-        results['price_data'] = validator.validate_price_data(price_df)
-    
-    if macro_df is not None:
-        logger.info("Validating macro data...")
-        results['macro_data'] = validator.validate_macro_data(macro_df)
     
-    if trends_df is not None:
-        logger.info("Validating trends data...")
-        results['trends_data'] = validator.validate_trends_data(trends_df)
-    
-    if news_df is not None:
-        logger.info("Validating news data...")
-        results['news_data'] = validator.validate_news_data(news_df)
+    # The frames share no state and the heavy lifting happens in NumPy,
+    # which releases the GIL, so the validations run side by side
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {}
+        
+        if price_df is not None:
+            logger.info("Validating price data...")
+            futures['price_data'] = executor.submit(validator.validate_price_data, price_df)
+        
+        if macro_df is not None:
+            logger.info("Validating macro data...")
+            futures['macro_data'] = executor.submit(validator.validate_macro_data, macro_df)
+        
+        if trends_df is not None:
+            logger.info("Validating trends data...")
+            futures['trends_data'] = executor.submit(validator.validate_trends_data, trends_df)
+        
+        if news_df is not None:
+            logger.info("Validating news data...")
+            futures['news_data'] = executor.submit(validator.validate_news_data, news_df)
+        
+        results = {data_type: future.result() for data_type, future in futures.items()}
     
-    # Generate overall report
-    report = validator.generate_quality_report(results)
-    logger.info(f"\n{report}")
+    # Generate overall report (skipped entirely when INFO is filtered out)
+    if logger.isEnabledFor(logging.INFO):
+        report = validator.generate_quality_report(results)
+        logger.info("\n%s", report)
     
     return results
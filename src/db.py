@@ -0,0 +1,33 @@
+"""
+Shared database access for the ETL scripts
+Provides a single pooled SQLAlchemy engine per process
+"""
+
+from functools import lru_cache
+from sqlalchemy import create_engine
+from config import database_config
+
+@lru_cache(maxsize=1)
+def get_engine():
+    """
+    Get the process-wide SQLAlchemy engine, creating it on first call
+    
+    Every ETL module shares this engine (and so one connection pool), which
+    keeps concurrent pipeline runs within the pool limits in
+    database_config() instead of opening a pool per module.
+    
+    Returns:
+        Engine: SQLAlchemy engine for PG_DSN
+    """
+    config = database_config()
+    if not config['dsn']:
+        raise ValueError("PG_DSN environment variable not set")
+    
+    return create_engine(
+        config['dsn'],
+        pool_size=config['pool_size'],
+        max_overflow=config['max_overflow'],
+        pool_timeout=config['pool_timeout'],
+        pool_recycle=config['pool_recycle'],
+        pool_pre_ping=True
+    )
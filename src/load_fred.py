@@ -4,12 +4,18 @@ Fetches key economic indicators like CPI, unemployment, interest rates
 """
 
 import os
+import io
+import csv
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from datetime import datetime, timedelta
+from types import MappingProxyType
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from fredapi import Fred
 from dotenv import load_dotenv
+from db import get_engine
 
 # Load environment variables
 load_dotenv()
@@ -18,14 +24,132 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def get_fred_data(fred_api_key, indicators, start_date=None):
+# Days before the latest stored observation to re-fetch, covering revisions
+REVISION_WINDOW_DAYS = 90
+
+# Staging table for COPY; unlogged since its contents are transient
+MACRO_STAGE_DDL = """
+    CREATE UNLOGGED TABLE IF NOT EXISTS f_macro_stage (
+        indicator_id VARCHAR(50),
+        date DATE,
+        value DECIMAL(15,6)
+    )
+"""
+
+MACRO_MERGE_SQL = """
+    MERGE INTO f_macro AS t
+    USING f_macro_stage AS s
+    ON t.indicator_id = s.indicator_id AND t.date = s.date
+    WHEN MATCHED THEN
+        UPDATE SET value = s.value, created_at = CURRENT_TIMESTAMP
+    WHEN NOT MATCHED THEN
+        INSERT (indicator_id, date, value) VALUES (s.indicator_id, s.date, s.value)
+"""
+
+MACRO_UPSERT_SQL = """
+    INSERT INTO f_macro (indicator_id, date, value)
+    SELECT indicator_id, date, value FROM f_macro_stage
+    ON CONFLICT (indicator_id, date) 
+    DO UPDATE SET 
+        value = EXCLUDED.value,
+        created_at = CURRENT_TIMESTAMP
+"""
+
+# Key macroeconomic indicators, frozen so the mapping (and its key order,
+# reused as the indicator_id categories) is built once per process
+_INDICATORS = MappingProxyType({
+    'CPIAUCSL': 'Consumer Price Index for All Urban Consumers: All Items',
+    'UNRATE': 'Unemployment Rate',
+    'FEDFUNDS': 'Federal Funds Effective Rate',
+    'UMCSENT': 'University of Michigan: Consumer Sentiment',
+    'DGS10': '10-Year Treasury Constant Maturity Rate',
+    'DGS2': '2-Year Treasury Constant Maturity Rate',
+    'DGS30': '30-Year Treasury Constant Maturity Rate',
+    'GDP': 'Gross Domestic Product',
+    'PAYEMS': 'All Employees, Total Nonfarm',
+    'INDPRO': 'Industrial Production Index',
+    'RSXFS': 'Advance Retail Sales: Retail Trade',  # Corrected indicator
+    'HOUST': 'Housing Starts: Total: New Privately Owned Housing Units Started',  # Corrected indicator
+    'DGORDER': 'Manufacturers New Orders: Durable Goods',  # Corrected indicator
+    'TCU': 'Capacity Utilization: Total Industry',  # Corrected indicator
+    'M2SL': 'M2 Money Stock',
+    'TOTALSA': 'Total Vehicle Sales',
+    'CSUSHPISA': 'S&P/Case-Shiller U.S. National Home Price Index',
+    'RECPROUSM156N': 'Recession Probabilities',
+    'T10Y2Y': '10-Year Treasury Constant Maturity Minus 2-Year Treasury Constant Maturity',
+    'T10Y3M': '10-Year Treasury Constant Maturity Minus 3-Month Treasury Constant Maturity'
+})
+
+def _fetch_indicator(fred, indicator_id, description, start_date):
+    """
+    Fetch a single FRED series
+    
+    Args:
+        fred (Fred): Shared FRED client
+        indicator_id (str): FRED series ID
+        description (str): Human-readable series name
+        start_date (str): Start date for data (YYYY-MM-DD format)
+    
+    Returns:
+        pd.Series or None: Observations indexed by date, or None if nothing was fetched
+    """
+    try:
+        logger.info(f"Fetching {indicator_id}: {description}")
+        
+        # Fetch data from FRED
+        data = fred.get_series(indicator_id, start=start_date)
+        
+        if data.empty:
+            logger.warning(f"No data found for {indicator_id}")
+            return None
+        
+        logger.info(f"✅ Successfully fetched {len(data)} records for {indicator_id}")
+        return data
+        
+    except Exception as e:
+        logger.error(f"❌ Error fetching data for {indicator_id}: {e}")
+        return None
+
+def _incremental_start(start_date, last_date):
+    """
+    Start date for a series, given the latest date already loaded
+    
+    Re-fetches a short window before the last stored observation so that
+    revisions to recent releases are still picked up by the upsert.
+    """
+    if last_date is None:
+        return start_date
+    resume_from = (pd.Timestamp(last_date) - timedelta(days=REVISION_WINDOW_DAYS)).strftime('%Y-%m-%d')
+    return max(start_date, resume_from)
+
+def get_last_loaded_dates(engine):
+    """
+    Get the latest stored observation date for every indicator
+    
+    Args:
+        engine: SQLAlchemy engine
+    
+    Returns:
+        dict: indicator_id -> latest date in f_macro
+    """
+    with engine.connect() as conn:
+        result = conn.execute(text("SELECT indicator_id, MAX(date) FROM f_macro GROUP BY indicator_id"))
+        return {indicator_id: last_date for indicator_id, last_date in result}
+
+def get_fred_data(fred_api_key, indicators, start_date=None, max_workers=10, last_loaded=None):
     """
     Fetch macroeconomic data from FRED API
     
+    Series are requested concurrently since each call is a blocking HTTPS
+    round trip.
+    
     Args:
         fred_api_key (str): FRED API key
-        indicators (dict): Dictionary mapping indicator_id to description
+        indicators (Mapping): Mapping of indicator_id to description
         start_date (str): Start date for data (YYYY-MM-DD format)
+        max_workers (int): Maximum number of concurrent requests
+        last_loaded (dict): Optional indicator_id -> latest date already stored;
+            those series are only fetched from shortly before that date
     
     Returns:
         pd.DataFrame: Macro data with columns [indicator_id, date, value]
@@ -34,41 +158,49 @@ def get_fred_data(fred_api_key, indicators, start_date=None):
         start_date = (datetime.now() - timedelta(days=365*2)).strftime('%Y-%m-%d')
     
     fred = Fred(api_key=fred_api_key)
-    all_data = []
+    last_loaded = last_loaded or {}
+    fetched = {}
     
-    for indicator_id, description in indicators.items():
-        try:
-            logger.info(f"Fetching {indicator_id}: {description}")
-            
-            # Fetch data from FRED
-            data = fred.get_series(indicator_id, start=start_date)
-            
-            if data.empty:
-                logger.warning(f"No data found for {indicator_id}")
-                continue
-            
-            # Convert to DataFrame
-            df = pd.DataFrame({
-                'indicator_id': indicator_id,
-                'date': data.index.date,
-                'value': data.values
-            })
-            
-            all_data.append(df)
-            logger.info(f"✅ Successfully fetched {len(df)} records for {indicator_id}")
-            
-        except Exception as e:
-            logger.error(f"❌ Error fetching data for {indicator_id}: {e}")
-            continue
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _fetch_indicator, fred, indicator_id, description,
+                _incremental_start(start_date, last_loaded.get(indicator_id))
+            ): indicator_id
+            for indicator_id, description in indicators.items()
+        }
+        for future in as_completed(futures):
+            data = future.result()
+            if data is not None:
+                fetched[futures[future]] = data
     
-    if all_data:
-        return pd.concat(all_data, ignore_index=True)
-    else:
+    if not fetched:
         return pd.DataFrame()
+    
+    # Gather plain arrays (in configured indicator order) and build a single
+    # DataFrame at the end rather than concatenating many small frames
+    ids, dates, values = [], [], []
+    for indicator_id in indicators:
+        data = fetched.get(indicator_id)
+        if data is None:
+            continue
+        ids.append(np.full(len(data), indicator_id, dtype=object))
+        dates.append(data.index.values.astype('datetime64[D]'))
+        values.append(data.to_numpy(dtype=np.float64))
+    
+    return pd.DataFrame({
+        'indicator_id': pd.Categorical(np.concatenate(ids), categories=list(indicators)),
+        'date': np.concatenate(dates),
+        'value': np.concatenate(values)
+    })
 
 def load_macro_to_db(df, engine):
     """
-    Load macroeconomic data to PostgreSQL database using batch upsert
+    Load macroeconomic data to PostgreSQL database
+    
+    Rows are bulk-loaded with COPY into an unlogged staging table and then
+    merged into f_macro with one set-based MERGE (or INSERT ... ON CONFLICT
+    before PostgreSQL 15), all in a single transaction.
     
     Args:
         df (pd.DataFrame): Macro data
@@ -79,38 +211,36 @@ def load_macro_to_db(df, engine):
         return
     
     try:
-        # Use pandas to_sql with method='upsert' equivalent
-        # First, we'll use a custom batch upsert approach
-        with engine.connect() as conn:
-            # Process in batches of 1000 records
-            batch_size = 1000
-            total_rows = len(df)
-            
-            for i in range(0, total_rows, batch_size):
-                batch_df = df.iloc[i:i+batch_size]
-                logger.info(f"Loading batch {i//batch_size + 1}/{(total_rows-1)//batch_size + 1} ({len(batch_df)} records)")
-                
-                # Use pandas to_sql for batch insert
-                batch_df.to_sql('f_macro_temp', engine, if_exists='replace', index=False)
-                
-                # Use SQL to upsert from temp table
-                upsert_sql = text("""
-                    INSERT INTO f_macro (indicator_id, date, value)
-                    SELECT indicator_id, date, value FROM f_macro_temp
-                    ON CONFLICT (indicator_id, date) 
-                    DO UPDATE SET 
-                        value = EXCLUDED.value,
-                        created_at = CURRENT_TIMESTAMP
-                """)
-                
-                conn.execute(upsert_sql)
-                
-                # Drop temp table
-                conn.execute(text("DROP TABLE IF EXISTS f_macro_temp"))
-                conn.commit()
-            
-            logger.info(f"✅ Successfully loaded {len(df)} macro records to database")
-            
+        # Convert each column in one C-level tolist(): datetime64[D] yields
+        # plain date objects and float64 yields floats (NaN -> NULL)
+        ids = df['indicator_id'].astype(str).tolist()
+        dates = df['date'].to_numpy(dtype='datetime64[D]').tolist()
+        values = [None if value != value else value for value in df['value'].to_numpy(dtype=np.float64).tolist()]
+        
+        # Unquoted empty CSV fields are read back as NULL
+        buf = io.StringIO()
+        csv.writer(buf).writerows(zip(ids, dates, values))
+        buf.seek(0)
+        
+        raw_conn = engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cur:
+                cur.execute(MACRO_STAGE_DDL)
+                cur.execute("TRUNCATE f_macro_stage")
+                cur.copy_expert("COPY f_macro_stage (indicator_id, date, value) FROM STDIN WITH (FORMAT csv)", buf)
+                # MERGE is available from PostgreSQL 15; older servers fall
+                # back to INSERT ... ON CONFLICT
+                cur.execute(MACRO_MERGE_SQL if raw_conn.server_version >= 150000 else MACRO_UPSERT_SQL)
+                cur.execute("TRUNCATE f_macro_stage")
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+        
+        logger.info(f"✅ Successfully loaded {len(df)} macro records to database")
+        
     except Exception as e:
         logger.error(f"❌ Error loading data to database: {e}")
         raise
@@ -120,45 +250,19 @@ def main():
     
     # Get API key and database connection
     fred_api_key = os.getenv('FRED_API_KEY')
-    pg_dsn = os.getenv('PG_DSN')
     
     if not fred_api_key:
         raise ValueError("FRED_API_KEY environment variable not set")
-    if not pg_dsn:
-        raise ValueError("PG_DSN environment variable not set")
-    
-    engine = create_engine(pg_dsn)
-    
-    # Define key macroeconomic indicators
-    indicators = {
-        'CPIAUCSL': 'Consumer Price Index for All Urban Consumers: All Items',
-        'UNRATE': 'Unemployment Rate',
-        'FEDFUNDS': 'Federal Funds Effective Rate',
-        'UMCSENT': 'University of Michigan: Consumer Sentiment',
-        'DGS10': '10-Year Treasury Constant Maturity Rate',
-        'DGS2': '2-Year Treasury Constant Maturity Rate',
-        'DGS30': '30-Year Treasury Constant Maturity Rate',
-        'GDP': 'Gross Domestic Product',
-        'PAYEMS': 'All Employees, Total Nonfarm',
-        'INDPRO': 'Industrial Production Index',
-        'RSXFS': 'Advance Retail Sales: Retail Trade',  # Corrected indicator
-        'HOUST': 'Housing Starts: Total: New Privately Owned Housing Units Started',  # Corrected indicator
-        'DGORDER': 'Manufacturers New Orders: Durable Goods',  # Corrected indicator
-        'TCU': 'Capacity Utilization: Total Industry',  # Corrected indicator
-        'M2SL': 'M2 Money Stock',
-        'TOTALSA': 'Total Vehicle Sales',
-        'CSUSHPISA': 'S&P/Case-Shiller U.S. National Home Price Index',
-        'RECPROUSM156N': 'Recession Probabilities',
-        'T10Y2Y': '10-Year Treasury Constant Maturity Minus 2-Year Treasury Constant Maturity',
-        'T10Y3M': '10-Year Treasury Constant Maturity Minus 3-Month Treasury Constant Maturity'
-    }
+    
+    engine = get_engine()
     
     logger.info("🚀 Starting macroeconomic data ETL process")
     
     try:
-        # Fetch data for last 2 years
+        # Fetch data for last 2 years, resuming series that are already loaded
         start_date = (datetime.now() - timedelta(days=365*2)).strftime('%Y-%m-%d')
-        macro_data = get_fred_data(fred_api_key, indicators, start_date)
+        last_loaded = get_last_loaded_dates(engine)
+        macro_data = get_fred_data(fred_api_key, _INDICATORS, start_date, last_loaded=last_loaded)
         
         # Load to database
         load_macro_to_db(macro_data, engine)
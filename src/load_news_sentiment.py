@@ -4,14 +4,19 @@ Fetches news headlines and analyzes sentiment using VADER
 """
 
 import os
+import io
+import re
+import csv
 import pandas as pd
-from sqlalchemy import create_engine, text
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from db import get_engine
 
 # Load environment variables
 load_dotenv()
@@ -23,59 +28,88 @@ logger = logging.getLogger(__name__)
 # Initialize VADER sentiment analyzer
 analyzer = SentimentIntensityAnalyzer()
 
-def get_news_data(symbols, api_key=None):
+# Shared NewsAPI session so pages and symbols reuse pooled TLS connections
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+
+# URLs and whitespace runs carry no sentiment; strip them before scoring
+_URL_RE = re.compile(r'https?://\S+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def clean_titles(titles):
+    """
+    Strip URLs and collapse whitespace runs in headlines before VADER scoring
+    
+    Args:
+        titles (list): Raw headline strings
+    
+    Returns:
+        list: Cleaned headline strings, in the same order
+    """
+    return [_WHITESPACE_RE.sub(' ', _URL_RE.sub(' ', title)).strip() for title in titles]
+
+def get_news_data(symbols, api_key=None, max_workers=5):
     """
     Fetch news data for given symbols
     Uses free news APIs or web scraping as fallback
     
+    Symbols are fetched concurrently (at most max_workers requests in
+    flight); sentiment scoring then runs in symbol order.
+    
     Args:
         symbols (list): List of stock symbols
         api_key (str): Optional API key for paid news service
+        max_workers (int): Maximum number of concurrent symbol fetches
     
     Returns:
-        pd.DataFrame: News data with sentiment scores
+        list: News records (dicts keyed by f_news_sentiment column) with
+            sentiment scores; build a DataFrame from them if one is needed
     """
-    all_news = []
+    fetched = []
     
-    for symbol in symbols:
-        try:
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for symbol in symbols:
             logger.info(f"Fetching news for {symbol}")
-            
             # Use real news API if key is provided, otherwise use mock data
-            news_items = get_real_news_data(symbol, api_key)
-            
-            for item in news_items:
-                # Analyze sentiment
-                sentiment_scores = analyzer.polarity_scores(item['title'])
-                
-                news_data = {
-                    'symbol': symbol,
-                    'fetched_at': datetime.now(),
-                    'published_at': item['published_at'],
-                    'source': item['source'],
-                    'title': item['title'],
-                    'url': item['url'],
-                    'vader_compound': sentiment_scores['compound'],
-                    'vader_positive': sentiment_scores['pos'],
-                    'vader_negative': sentiment_scores['neg'],
-                    'vader_neutral': sentiment_scores['neu']
-                }
+            futures[symbol] = executor.submit(get_real_news_data, symbol, api_key)
+        
+        for symbol, future in futures.items():
+            try:
+                news_items = future.result()
+                fetched.extend((symbol, item) for item in news_items)
+                logger.info(f"✅ Successfully processed {len(news_items)} news items for {symbol}")
                 
-                all_news.append(news_data)
-            
-            logger.info(f"✅ Successfully processed {len(news_items)} news items for {symbol}")
-            
-            # Rate limiting
-            time.sleep(1)
-            
-        except Exception as e:
-            logger.error(f"❌ Error fetching news for {symbol}: {e}")
-            continue
+            except Exception as e:
+                logger.error(f"❌ Error fetching news for {symbol}: {e}")
+                continue
     
-    if all_news:
-        return pd.DataFrame(all_news)
-    else:
-        return pd.DataFrame()
+    # Score every distinct headline once, in one tight pass after fetching;
+    # wire stories often surface for several symbols
+    titles = [item['title'] for _, item in fetched]
+    unique_titles = list(dict.fromkeys(titles))
+    scores_by_title = dict(zip(unique_titles, map(analyzer.polarity_scores, clean_titles(unique_titles))))
+    scores = [scores_by_title[title] for title in titles]
+    
+    # One timestamp for the whole run, so fetched_at identifies the batch
+    run_ts = datetime.now()
+    
+    return [
+        {
+            'symbol': symbol,
+            'fetched_at': run_ts,
+            'published_at': item['published_at'],
+            'source': item['source'],
+            'title': item['title'],
+            'url': item['url'],
+            'vader_compound': sentiment_scores['compound'],
+            'vader_positive': sentiment_scores['pos'],
+            'vader_negative': sentiment_scores['neg'],
+            'vader_neutral': sentiment_scores['neu']
+        }
+        for (symbol, item), sentiment_scores in zip(fetched, scores)
+    ]
 
 def get_mock_news_data(symbol):
     """
@@ -83,24 +117,25 @@ def get_mock_news_data(symbol):
     In production, replace with actual news API calls
     """
     # This is a placeholder - replace with actual news API integration
+    now = datetime.now()
     mock_news = [
         {
             'title': f'{symbol} shows strong performance in latest trading session',
             'source': 'Financial News',
             'url': f'https://example.com/news/{symbol}-1',
-            'published_at': datetime.now() - timedelta(hours=2)
+            'published_at': now - timedelta(hours=2)
         },
         {
             'title': f'Analysts raise price target for {symbol} following earnings beat',
             'source': 'Market Watch',
             'url': f'https://example.com/news/{symbol}-2',
-            'published_at': datetime.now() - timedelta(hours=4)
+            'published_at': now - timedelta(hours=4)
         },
         {
             'title': f'{symbol} faces headwinds amid market volatility concerns',
             'source': 'Reuters',
             'url': f'https://example.com/news/{symbol}-3',
-            'published_at': datetime.now() - timedelta(hours=6)
+            'published_at': now - timedelta(hours=6)
         }
     ]
     
@@ -136,20 +171,23 @@ def get_real_news_data(symbol, api_key=None):
             # Fetch multiple pages to get more results
             max_pages = 3  # NewsAPI free tier allows up to 100 results (5 pages with pageSize 20)
             
+            # Date window is computed once per query, in UTC to match
+            # NewsAPI's publishedAt, and shared by every page
+            now = datetime.now(timezone.utc)
+            base_params = {
+                'q': query,
+                'language': 'en',
+                'sortBy': 'publishedAt',
+                'pageSize': 100,  # Maximum allowed by NewsAPI
+                'from': (now - timedelta(days=30)).strftime('%Y-%m-%d'),  # Last 30 days
+                'to': now.strftime('%Y-%m-%d')
+            }
+            
             for page in range(1, max_pages + 1):
-                url = "https://newsapi.org/v2/everything"
-                params = {
-                    'q': query,
-                    'apiKey': api_key,
-                    'language': 'en',
-                    'sortBy': 'publishedAt',
-                    'pageSize': 100,  # Maximum allowed by NewsAPI
-                    'page': page,  # Pagination
-                    'from': (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d'),  # Last 30 days
-                    'to': datetime.now().strftime('%Y-%m-%d')
-                }
+                params = {**base_params, 'page': page}  # Pagination
                 
-                response = requests.get(url, params=params, timeout=30)
+                # The key travels as a header rather than a query parameter
+                response = _SESSION.get(NEWS_API_URL, params=params, headers={'X-Api-Key': api_key}, timeout=30)
                 
                 if response.status_code != 200:
                     logger.warning(f"NewsAPI returned status {response.status_code}: {response.text}")
@@ -163,43 +201,35 @@ def get_real_news_data(symbol, api_key=None):
                 if not articles:
                     break  # No more articles
                 
-                for article in articles:
-                    # Skip articles that don't have required fields
-                    if not article.get('title') or not article.get('publishedAt'):
-                        continue
-                        
-                    try:
-                        # Parse date
-                        pub_date_str = article['publishedAt'].replace('Z', '+00:00')
-                        pub_date = datetime.fromisoformat(pub_date_str)
-                        
-                        news_item = {
-                            'title': article['title'],
-                            'source': article.get('source', {}).get('name', 'Unknown'),
-                            'url': article.get('url', ''),
-                            'published_at': pub_date
-                        }
-                        all_news_items.append(news_item)
-                    except Exception as e:
-                        logger.debug(f"Error parsing article: {e}")
+                # Skip articles that don't have required fields
+                valid = [a for a in articles if a.get('title') and a.get('publishedAt')]
+                
+                # Parse the page's timestamps in one vectorized call; malformed
+                # values come back as NaT and are dropped
+                published = pd.to_datetime([a['publishedAt'] for a in valid], utc=True, format='ISO8601', errors='coerce')
+                
+                for article, pub_date, parsed in zip(valid, published.to_pydatetime(), published.notna()):
+                    if not parsed:
+                        logger.debug(f"Error parsing article date: {article['publishedAt']}")
                         continue
+                    
+                    all_news_items.append({
+                        'title': article['title'],
+                        'source': (article.get('source') or {}).get('name', 'Unknown'),
+                        'url': article.get('url', ''),
+                        'published_at': pub_date
+                    })
                 
                 logger.debug(f"Fetched page {page}: {len(articles)} articles")
-                
-                # Small delay to respect rate limits
-                time.sleep(1)
         
         except Exception as e:
             logger.error(f"Error fetching news for query '{query}': {e}")
         
-        # Remove duplicates based on title
-        seen_titles = set()
-        unique_news = []
+        # Remove duplicates based on the normalized title, keeping the first
+        unique_by_title = {}
         for item in all_news_items:
-            title_lower = item['title'].lower().strip()
-            if title_lower not in seen_titles:
-                seen_titles.add(title_lower)
-                unique_news.append(item)
+            unique_by_title.setdefault(item['title'].strip().lower(), item)
+        unique_news = list(unique_by_title.values())
         
         logger.info(f"✅ Fetched {len(unique_news)} unique news articles for {symbol}")
         return unique_news if unique_news else get_mock_news_data(symbol)
@@ -208,49 +238,45 @@ def get_real_news_data(symbol, api_key=None):
         logger.error(f"Error fetching real news data for {symbol}: {e}")
         return get_mock_news_data(symbol)
 
-def load_news_to_db(df, engine):
+def load_news_to_db(records, engine):
     """
     Load news sentiment data to PostgreSQL database
     
     Args:
-        df (pd.DataFrame): News sentiment data
+        records (list): News sentiment records as returned by get_news_data
         engine: SQLAlchemy engine
     """
-    if df.empty:
+    if not records:
         logger.warning("No data to load")
         return
     
+    columns = ['symbol', 'fetched_at', 'published_at', 'source', 'title', 'url',
+               'vader_compound', 'vader_positive', 'vader_negative', 'vader_neutral']
+    
     try:
-        with engine.connect() as conn:
-            # Clear existing data and reset ID sequence
-            logger.info("Clearing existing news sentiment data...")
-            conn.execute(text("TRUNCATE TABLE f_news_sentiment RESTART IDENTITY CASCADE"))
-            conn.commit()
-            
-            for _, row in df.iterrows():
-                insert_sql = text("""
-                    INSERT INTO f_news_sentiment 
-                    (symbol, fetched_at, published_at, source, title, url, 
-                     vader_compound, vader_positive, vader_negative, vader_neutral)
-                    VALUES (:symbol, :fetched_at, :published_at, :source, :title, :url,
-                            :vader_compound, :vader_positive, :vader_negative, :vader_neutral)
-                """)
-                
-                conn.execute(insert_sql, {
-                    'symbol': row['symbol'],
-                    'fetched_at': row['fetched_at'],
-                    'published_at': row['published_at'],
-                    'source': row['source'],
-                    'title': row['title'],
-                    'url': row['url'],
-                    'vader_compound': float(row['vader_compound']),
-                    'vader_positive': float(row['vader_positive']),
-                    'vader_negative': float(row['vader_negative']),
-                    'vader_neutral': float(row['vader_neutral'])
-                })
-            
-            conn.commit()
-            logger.info(f"✅ Successfully loaded {len(df)} news sentiment records to database")
+        # Serialize to CSV in one pass over the records; the csv module quotes
+        # titles containing commas, quotes or newlines, and unquoted empty
+        # fields load as NULL
+        buf = io.StringIO()
+        csv.writer(buf).writerows(map(itemgetter(*columns), records))
+        buf.seek(0)
+        
+        # Truncate and reload in one transaction so readers never see an
+        # empty table
+        raw_conn = engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cur:
+                logger.info("Clearing existing news sentiment data...")
+                cur.execute("TRUNCATE TABLE f_news_sentiment RESTART IDENTITY CASCADE")
+                cur.copy_expert(f"COPY f_news_sentiment ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+        
+        logger.info(f"✅ Successfully loaded {len(records)} news sentiment records to database")
             
     except Exception as e:
         logger.error(f"❌ Error loading data to database: {e}")
@@ -261,12 +287,7 @@ def main():
     
     # Get API key and database connection
     news_api_key = os.getenv('NEWS_API_KEY')  # Optional
-    pg_dsn = os.getenv('PG_DSN')
-    
-    if not pg_dsn:
-        raise ValueError("PG_DSN environment variable not set")
-    
-    engine = create_engine(pg_dsn)
+    engine = get_engine()
     
     # Define symbols to track for news
     # Note: Using 'VIX' (not '^VIX') for news queries since ^ symbol would confuse search
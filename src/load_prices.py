@@ -4,12 +4,17 @@ Fetches intraday data for major indices and sector ETFs
 """
 
 import os
+import io
+import re
+import time
 import yfinance as yf
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from datetime import datetime, timedelta
 import logging
 from dotenv import load_dotenv
+from db import get_engine
+from config import MARKET_HOURS, get_market_status
 
 # Load environment variables
 load_dotenv()
@@ -18,137 +23,525 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def get_price_data(symbols, period="1mo", interval="1d"):
+# Parquet cache of downloaded histories, and how long a cached history is
+# served before the bars since its last date are fetched. Prices run every 30
+# minutes in market hours, so the intraday TTL stays below that and daily
+# histories fall back to it while the market is open
+PRICE_CACHE_DIR = os.path.join('cache', 'prices')
+INTRADAY_CACHE_TTL = timedelta(minutes=15)
+DAILY_CACHE_TTL = timedelta(days=1)
+
+# Fetched-but-not-yet-loaded frames, one Parquet file per run, removed once
+# committed; a staged run that fails this many resumed loads is quarantined
+PRICE_STAGING_DIR = os.path.join('cache', 'staging')
+PRICE_STAGING_MAX_ATTEMPTS = 3
+
+# f_price_daily columns written by the loader, the DECIMAL ones among them,
+# and the value columns compared to skip no-op upserts
+PRICE_COLUMNS = ['symbol', 'date', 'open', 'high', 'low', 'close', 'adj_close',
+                 'volume', 'dividends', 'stock_splits', 'capital_gains']
+PRICE_FLOAT_COLUMNS = ['open', 'high', 'low', 'close', 'adj_close', 'dividends', 'stock_splits', 'capital_gains']
+PRICE_VALUE_COLUMNS = PRICE_COLUMNS[2:]
+PRICE_ARROW_DTYPES = {
+    'symbol': 'string[pyarrow]',
+    'date': 'date32[pyarrow]',
+    **dict.fromkeys(PRICE_FLOAT_COLUMNS, 'float64[pyarrow]'),
+    'volume': 'int64[pyarrow]'
+}
+
+# Staging table for COPY; unlogged since its contents are transient
+PRICE_STAGE_DDL = """
+    CREATE UNLOGGED TABLE IF NOT EXISTS f_price_daily_stage (
+        symbol VARCHAR(20),
+        date DATE,
+        open DECIMAL(12,4),
+        high DECIMAL(12,4),
+        low DECIMAL(12,4),
+        close DECIMAL(12,4),
+        adj_close DECIMAL(12,4),
+        volume BIGINT,
+        dividends DECIMAL(12,4),
+        stock_splits DECIMAL(12,4),
+        capital_gains DECIMAL(12,4)
+    )
+"""
+
+def _db_symbol(symbol):
+    """Symbol as stored in the database (^VIX is stored as VIX)"""
+    return 'VIX' if symbol == '^VIX' else symbol
+
+def get_last_loaded_dates(engine):
     """
-    Fetch price data for given symbols
+    Get the latest stored trading date for every symbol
+    
+    Args:
+        engine: SQLAlchemy engine
+    
+    Returns:
+        dict: database symbol -> latest date in f_price_daily
+    """
+    with engine.connect() as conn:
+        result = conn.execute(text("SELECT symbol, MAX(date) FROM f_price_daily GROUP BY symbol"))
+        return {symbol: last_date for symbol, last_date in result}
+
+def _normalize_history(symbol, data):
+    """
+    Normalize the downloaded price history of a single symbol
+    
+    Args:
+        symbol (str): Stock symbol
+        data (pd.DataFrame): The symbol's OHLCV history as returned by yfinance
+    
+    Returns:
+        pd.DataFrame or None: Price data for the symbol, None if Yahoo returned nothing
+    """
+    # Bulk downloads align every symbol on one index, padding dates where a
+    # symbol has no bar (or failed entirely) with NaN prices
+    price_columns = [col for col in ('Open', 'High', 'Low', 'Close') if col in data.columns]
+    data = data.dropna(subset=price_columns, how='all')
+    
+    if data.empty:
+        logger.warning(f"No data found for {symbol}")
+        return None
+    
+    # Reset index to get date as column
+    data = data.reset_index()
+    # Map ^VIX to VIX for database consistency
+    data['symbol'] = _db_symbol(symbol)
+    
+    # Rename columns to match database schema (handle different column names)
+    column_mapping = {
+        'Date': 'date',
+        'Datetime': 'date',  # For intraday data
+        'Open': 'open', 
+        'High': 'high',
+        'Low': 'low',
+        'Close': 'close',
+        'Adj Close': 'adj_close',
+        'Volume': 'volume',
+        'Dividends': 'dividends',
+        'Stock Splits': 'stock_splits',
+        'Capital Gains': 'capital_gains'
+    }
+    
+    # Check which columns exist and rename them
+    for old_name, new_name in column_mapping.items():
+        if old_name in data.columns:
+            data = data.rename(columns={old_name: new_name})
+    
+    # Handle missing date column (use index if no date column)
+    if 'date' not in data.columns and not data.empty:
+        data['date'] = data.index
+    
+    # Handle missing adj_close column (use close if adj_close doesn't exist)
+    if 'adj_close' not in data.columns and 'close' in data.columns:
+        data['adj_close'] = data['close']
+    
+    # Select only required columns (only include columns that exist)
+    required_columns = ['symbol', 'date']
+    optional_columns = ['open', 'high', 'low', 'close', 'adj_close', 'volume', 'dividends', 'stock_splits', 'capital_gains']
+    
+    for col in optional_columns:
+        if col in data.columns:
+            required_columns.append(col)
+    
+    data = data[required_columns]
+    
+    logger.info(f"✅ Successfully fetched {len(data)} records for {symbol}")
+    return data
+
+def _download_histories(symbols, max_workers, **window):
+    """
+    Download and normalize several symbols with one bulk yf.download() call
     
     Args:
         symbols (list): List of stock symbols
-        period (str): Time period for data (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
-        interval (str): Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+        max_workers (int): Maximum number of concurrent downloads
+        **window: period/start/interval arguments passed to yf.download()
     
     Returns:
-        pd.DataFrame: Price data with columns [symbol, date, open, high, low, close, adj_close, volume]
+        dict: symbol -> normalized price frame, for symbols that returned data
     """
-    all_data = []
+    logger.info(f"Fetching data for {len(symbols)} symbols")
+    # Same adjustment and tz handling as Ticker.history(), plus corporate actions
+    raw = yf.download(symbols, group_by='ticker', threads=max_workers, auto_adjust=True,
+                      actions=True, ignore_tz=False, progress=False, **window)
+    
+    if raw is None or raw.empty:
+        logger.warning("No price data returned")
+        return {}
+    
+    histories = {}
     
     for symbol in symbols:
         try:
-            logger.info(f"Fetching data for {symbol}")
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period, interval=interval)
-            
-            if data.empty:
-                logger.warning(f"No data found for {symbol}")
-                continue
-            
-            # Reset index to get date as column
-            data = data.reset_index()
-            # Map ^VIX to VIX for database consistency
-            db_symbol = 'VIX' if symbol == '^VIX' else symbol
-            data['symbol'] = db_symbol
-            
-            # Rename columns to match database schema (handle different column names)
-            column_mapping = {
-                'Date': 'date',
-                'Datetime': 'date',  # For intraday data
-                'Open': 'open', 
-                'High': 'high',
-                'Low': 'low',
-                'Close': 'close',
-                'Adj Close': 'adj_close',
-                'Volume': 'volume',
-                'Dividends': 'dividends',
-                'Stock Splits': 'stock_splits',
-                'Capital Gains': 'capital_gains'
-            }
+            if isinstance(raw.columns, pd.MultiIndex):
+                if symbol not in raw.columns.get_level_values(0):
+                    logger.warning(f"No data found for {symbol}")
+                    continue
+                data = raw[symbol]
+            else:
+                data = raw
             
-            # Check which columns exist and rename them
-            for old_name, new_name in column_mapping.items():
-                if old_name in data.columns:
-                    data = data.rename(columns={old_name: new_name})
-            
-            # Handle missing date column (use index if no date column)
-            if 'date' not in data.columns and not data.empty:
-                data['date'] = data.index
-            
-            # Handle missing adj_close column (use close if adj_close doesn't exist)
-            if 'adj_close' not in data.columns and 'close' in data.columns:
-                data['adj_close'] = data['close']
-            
-            # Select only required columns (only include columns that exist)
-            required_columns = ['symbol', 'date']
-            optional_columns = ['open', 'high', 'low', 'close', 'adj_close', 'volume', 'dividends', 'stock_splits', 'capital_gains']
-            
-            for col in optional_columns:
-                if col in data.columns:
-                    required_columns.append(col)
-            
-            data = data[required_columns]
-            
-            all_data.append(data)
-            logger.info(f"✅ Successfully fetched {len(data)} records for {symbol}")
+            data = _normalize_history(symbol, data)
+            if data is not None:
+                histories[symbol] = data
             
         except Exception as e:
             logger.error(f"❌ Error fetching data for {symbol}: {e}")
             continue
     
+    return histories
+
+def _cache_path(cache_dir, symbol, interval):
+    """Parquet file holding the cached history of one (symbol, interval)"""
+    return os.path.join(cache_dir, f"{symbol.replace('^', 'idx_')}_{interval}.parquet")
+
+def _read_cache(path, ttl, final_after_close=False):
+    """
+    Read a cached price history
+    
+    Args:
+        path (str): Parquet file path
+        ttl (timedelta): Age below which the cache is served without refetching
+        final_after_close (bool): Also require the cache to have been written
+            after the close of its last bar's session, so a partial daily bar
+            is never served as final
+    
+    Returns:
+        tuple: (frame or None, whether the cache is still fresh)
+    """
+    if not os.path.exists(path):
+        return None, False
+    
+    try:
+        data = pd.read_parquet(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable price cache {path}: {e}")
+        return None, False
+    
+    written = os.path.getmtime(path)
+    if time.time() - written >= ttl.total_seconds():
+        return data, False
+    
+    if final_after_close and not data.empty:
+        # Market times are local wall-clock, as in config.get_market_status
+        last_session = pd.Timestamp(data['date'].max()).date()
+        close = datetime.combine(last_session, datetime.strptime(MARKET_HOURS['close_time'], '%H:%M').time())
+        if datetime.fromtimestamp(written) < close:
+            return data, False
+    
+    return data, True
+
+def _trim_to_period(data, period):
+    """
+    Drop cached rows older than a yfinance period window (e.g. 5d, 3mo, 1y)
+    
+    Day periods count trading days, as yfinance does; ytd/max are kept whole.
+    """
+    match = re.fullmatch(r'(\d+)(d|mo|y)', period)
+    if not match or data.empty:
+        return data
+    
+    count, unit = int(match.group(1)), match.group(2)
+    offset = {'d': pd.offsets.BDay(count), 'mo': pd.DateOffset(months=count), 'y': pd.DateOffset(years=count)}[unit]
+    cutoff = (pd.Timestamp.now(tz=data['date'].dt.tz) - offset).normalize()
+    
+    return data[data['date'] >= cutoff]
+
+def get_price_data(symbols, period="1mo", interval="1d", max_workers=8, cache_dir=PRICE_CACHE_DIR,
+                   last_loaded=None):
+    """
+    Fetch price data for given symbols
+    
+    Histories are cached per (symbol, interval) as Parquet. A cache younger
+    than its TTL is served as is; an older one is extended by downloading
+    only the bars since its last cached date, and symbols without a cache
+    fetch the full period, or only from their latest stored date when
+    last_loaded has one. Each group is one yf.download() call, which fans
+    the per-symbol requests out over its own thread pool; results are
+    concatenated in symbol order.
+    
+    Args:
+        symbols (list): List of stock symbols
+        period (str): Time period for data (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+        interval (str): Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+        max_workers (int): Maximum number of concurrent downloads
+        cache_dir (str): Directory for the Parquet cache, or None to always download
+        last_loaded (dict): Optional database symbol -> latest stored date, used
+            to fetch uncached symbols incrementally
+    
+    Returns:
+        pd.DataFrame: Price data with columns [symbol, date, open, high, low, close, adj_close, volume]
+    """
+    intraday = interval[-1] in 'mh'
+    ttl = INTRADAY_CACHE_TTL if intraday or get_market_status() == 'Open' else DAILY_CACHE_TTL
+    
+    cached = {}
+    stale = []
+    missing = []
+    
+    for symbol in symbols:
+        data, fresh = _read_cache(_cache_path(cache_dir, symbol, interval), ttl, not intraday) if cache_dir else (None, False)
+        if data is None:
+            missing.append(symbol)
+            continue
+        
+        cached[symbol] = data
+        if not fresh:
+            stale.append(symbol)
+    
+    # Uncached symbols already in the database resume from their latest
+    # stored day (re-fetched so a partial bar gets its final values)
+    last_loaded = last_loaded or {}
+    incremental = [symbol for symbol in missing if _db_symbol(symbol) in last_loaded]
+    full = [symbol for symbol in missing if _db_symbol(symbol) not in last_loaded]
+    
+    downloaded = {}
+    if full:
+        downloaded.update(_download_histories(full, max_workers, period=period, interval=interval))
+    if incremental:
+        start = min(last_loaded[_db_symbol(symbol)] for symbol in incremental)
+        logger.info(f"Fetching {interval} history since last load on {start:%Y-%m-%d}")
+        downloaded.update(_download_histories(incremental, max_workers, start=start.strftime('%Y-%m-%d'), interval=interval))
+    if stale:
+        # Refetch from the oldest last-cached day so partial bars get refreshed
+        start = min(cached[symbol]['date'].max() for symbol in stale)
+        logger.info(f"Extending cached {interval} history from {start:%Y-%m-%d}")
+        downloaded.update(_download_histories(stale, max_workers, start=start.strftime('%Y-%m-%d'), interval=interval))
+    
+    all_data = []
+    
+    for symbol in symbols:
+        parts = [data for data in (cached.get(symbol), downloaded.get(symbol)) if data is not None]
+        if not parts:
+            continue
+        
+        data = parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True, sort=False)
+        data = _trim_to_period(data.drop_duplicates(subset=['date'], keep='last', ignore_index=True), period)
+        
+        if cache_dir and symbol in downloaded:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                data.to_parquet(_cache_path(cache_dir, symbol, interval), index=False)
+            except Exception as e:
+                logger.warning(f"Could not write price cache for {symbol}: {e}")
+        
+        all_data.append(data)
+    
     if all_data:
         return pd.concat(all_data, ignore_index=True)
     else:
         return pd.DataFrame()
 
-def load_prices_to_db(df, engine):
+def _prepare_price_df(df):
+    """
+    Cast a price frame to database-ready values in one vectorized pass
+    
+    Columns become Arrow-backed (see PRICE_ARROW_DTYPES), which represent
+    missing values natively as NA, so the frame serializes straight to CSV
+    with empty (NULL) fields and no per-cell conversion.
+    
+    Args:
+        df (pd.DataFrame): Price data as returned by get_price_data
+    
+    Returns:
+        pd.DataFrame: Arrow-backed frame with columns PRICE_COLUMNS, one row per (symbol, date)
+    """
+    frame = df.reindex(columns=PRICE_COLUMNS)
+    frame['date'] = pd.to_datetime(frame['date']).dt.date
+    
+    # Intraday bars collapse onto one (symbol, date) key; a single set-based
+    # upsert cannot touch the same row twice, so keep the last bar
+    frame = frame.drop_duplicates(subset=['symbol', 'date'], keep='last')
+    
+    # Volume can be fractional (some assets, or yfinance's repair); round it
+    # to whole shares before the int64 cast, which rejects fractions
+    frame['volume'] = pd.to_numeric(frame['volume']).round()
+    
+    return frame.astype(PRICE_ARROW_DTYPES)
+
+def _staging_path(run_id, staging_dir=PRICE_STAGING_DIR):
+    """
+    Get the staged Parquet file for one run
+    
+    Args:
+        run_id (str): Run identifier
+        staging_dir (str): Staging directory
+    
+    Returns:
+        str: Parquet path
+    """
+    return os.path.join(staging_dir, f"prices_{run_id}.parquet")
+
+def find_pending_runs(staging_dir=PRICE_STAGING_DIR):
+    """
+    Find runs whose fetched frame was staged but never committed
+    
+    Args:
+        staging_dir (str): Staging directory
+    
+    Returns:
+        list: Run identifiers, oldest first
+    """
+    if not os.path.isdir(staging_dir):
+        return []
+    
+    # Run ids are timestamps, so lexical order is chronological
+    return sorted(
+        match.group(1)
+        for match in (re.fullmatch(r'prices_(.+)\.parquet', name) for name in os.listdir(staging_dir))
+        if match
+    )
+
+def _record_failed_attempt(run_id, staging_dir=PRICE_STAGING_DIR):
+    """
+    Count a failed resumed load, quarantining the run after too many
+    
+    The count lives in a small sidecar file next to the staged frame. Once
+    it reaches PRICE_STAGING_MAX_ATTEMPTS the frame is renamed to
+    *.parquet.failed, so later runs stop retrying it.
+    
+    Args:
+        run_id (str): Run identifier
+        staging_dir (str): Staging directory
+    """
+    parquet_path = _staging_path(run_id, staging_dir)
+    attempts_path = f"{parquet_path}.attempts"
+    try:
+        with open(attempts_path) as f:
+            attempts = int(f.read().strip() or 0) + 1
+    except (OSError, ValueError):
+        attempts = 1
+    
+    if attempts >= PRICE_STAGING_MAX_ATTEMPTS:
+        os.replace(parquet_path, f"{parquet_path}.failed")
+        if os.path.exists(attempts_path):
+            os.remove(attempts_path)
+        logger.error(f"Quarantined staged run {run_id} after {attempts} failed loads")
+    else:
+        with open(attempts_path, 'w') as f:
+            f.write(str(attempts))
+
+def resume_pending_runs(engine, staging_dir=PRICE_STAGING_DIR):
+    """
+    Load every staged run left behind by an earlier failed load
+    
+    Failures are logged and counted rather than raised, so a staged frame
+    that cannot be loaded never blocks the regular fetch.
+    
+    Args:
+        engine: SQLAlchemy engine
+        staging_dir (str): Staging directory
+    """
+    for run_id in find_pending_runs(staging_dir):
+        logger.info(f"Resuming load of staged run {run_id}")
+        try:
+            load_prices_to_db(None, engine, run_id=run_id, staging_dir=staging_dir)
+        except Exception as e:
+            logger.warning(f"Resumed load of staged run {run_id} failed: {e}")
+            _record_failed_attempt(run_id, staging_dir)
+
+def stage_price_data(df, run_id, staging_dir=PRICE_STAGING_DIR):
+    """
+    Persist a fetched price frame so a failed load can resume without refetching
+    
+    Args:
+        df (pd.DataFrame): Combined price data
+        run_id (str): Run identifier
+        staging_dir (str): Staging directory
+    """
+    parquet_path = _staging_path(run_id, staging_dir)
+    try:
+        os.makedirs(staging_dir, exist_ok=True)
+        
+        # Write then rename, so a crash never leaves a truncated file behind
+        tmp_path = f"{parquet_path}.tmp"
+        df.to_parquet(tmp_path, compression='zstd', index=False)
+        os.replace(tmp_path, parquet_path)
+        logger.info(f"Staged {len(df)} price records to {parquet_path}")
+    except Exception as e:
+        logger.warning(f"Could not stage price data for run {run_id}: {e}")
+
+def load_prices_to_db(df, engine, run_id=None, staging_dir=PRICE_STAGING_DIR):
     """
     Load price data to PostgreSQL database using upsert
     
+    Rows are bulk-loaded with COPY into an unlogged staging table and then
+    merged into f_price_daily with one INSERT ... SELECT ... ON CONFLICT.
+    With a run_id, the run's staged frame (see stage_price_data) is read
+    when df is None, and removed once the rows are committed.
+    
     Args:
-        df (pd.DataFrame): Price data
+        df (pd.DataFrame): Price data, or None to load the staged frame
         engine: SQLAlchemy engine
+        run_id (str): Run identifier of the staged frame
+        staging_dir (str): Staging directory
     """
-    if df.empty:
+    parquet_path = _staging_path(run_id, staging_dir) if run_id is not None else None
+    if df is None and parquet_path is not None and os.path.exists(parquet_path):
+        df = pd.read_parquet(parquet_path)
+        logger.info(f"Loaded {len(df)} staged price records from {parquet_path}")
+    
+    if df is None or df.empty:
         logger.warning("No data to load")
         return
     
+    # Merge the staged batch into f_price_daily in one set-based statement,
+    # leaving rows whose values are unchanged untouched (no new tuple or WAL)
+    merge_sql = f"""
+        INSERT INTO f_price_daily ({', '.join(PRICE_COLUMNS)})
+        SELECT {', '.join(PRICE_COLUMNS)} FROM f_price_daily_stage
+        ON CONFLICT (symbol, date) 
+        DO UPDATE SET 
+            open = EXCLUDED.open,
+            high = EXCLUDED.high,
+            low = EXCLUDED.low,
+            close = EXCLUDED.close,
+            adj_close = EXCLUDED.adj_close,
+            volume = EXCLUDED.volume,
+            dividends = EXCLUDED.dividends,
+            stock_splits = EXCLUDED.stock_splits,
+            capital_gains = EXCLUDED.capital_gains,
+            created_at = CURRENT_TIMESTAMP
+        WHERE ({', '.join(f'f_price_daily.{col}' for col in PRICE_VALUE_COLUMNS)})
+            IS DISTINCT FROM ({', '.join(f'EXCLUDED.{col}' for col in PRICE_VALUE_COLUMNS)})
+    """
+    
     try:
-        # Use pandas to_sql with method='upsert' equivalent
-        # First, we'll use a custom upsert approach
-        with engine.connect() as conn:
-            for _, row in df.iterrows():
-                upsert_sql = text("""
-                    INSERT INTO f_price_daily (symbol, date, open, high, low, close, adj_close, volume, dividends, stock_splits, capital_gains)
-                    VALUES (:symbol, :date, :open, :high, :low, :close, :adj_close, :volume, :dividends, :stock_splits, :capital_gains)
-                    ON CONFLICT (symbol, date) 
-                    DO UPDATE SET 
-                        open = EXCLUDED.open,
-                        high = EXCLUDED.high,
-                        low = EXCLUDED.low,
-                        close = EXCLUDED.close,
-                        adj_close = EXCLUDED.adj_close,
-                        volume = EXCLUDED.volume,
-                        dividends = EXCLUDED.dividends,
-                        stock_splits = EXCLUDED.stock_splits,
-                        capital_gains = EXCLUDED.capital_gains,
-                        created_at = CURRENT_TIMESTAMP
-                """)
-                
-                conn.execute(upsert_sql, {
-                    'symbol': row['symbol'],
-                    'date': row['date'].date(),
-                    'open': float(row['open']) if pd.notna(row['open']) else None,
-                    'high': float(row['high']) if pd.notna(row['high']) else None,
-                    'low': float(row['low']) if pd.notna(row['low']) else None,
-                    'close': float(row['close']) if pd.notna(row['close']) else None,
-                    'adj_close': float(row['adj_close']) if pd.notna(row['adj_close']) else None,
-                    'volume': int(row['volume']) if pd.notna(row['volume']) else None,
-                    'dividends': float(row['dividends']) if pd.notna(row['dividends']) else None,
-                    'stock_splits': float(row['stock_splits']) if pd.notna(row['stock_splits']) else None,
-                    'capital_gains': float(row['capital_gains']) if pd.notna(row['capital_gains']) else None
-                })
-            
-            conn.commit()
-            logger.info(f"✅ Successfully loaded {len(df)} price records to database")
-            
+        frame = _prepare_price_df(df)
+        
+        # pandas writes NA as an empty field, which COPY reads back as NULL
+        buf = io.StringIO()
+        frame.to_csv(buf, header=False, index=False)
+        buf.seek(0)
+        
+        # COPY into the unlogged staging table, merge, and clear the stage,
+        # all in one transaction
+        raw_conn = engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cur:
+                cur.execute(PRICE_STAGE_DDL)
+                cur.execute("TRUNCATE f_price_daily_stage")
+                cur.copy_expert(f"COPY f_price_daily_stage ({', '.join(PRICE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buf)
+                cur.execute(merge_sql)
+                cur.execute("TRUNCATE f_price_daily_stage")
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+        
+        logger.info(f"✅ Successfully loaded {len(df)} price records to database")
+        
+        # The rows are committed, so the staged frame is no longer needed; a
+        # crash before this only means an idempotent reload next run
+        if parquet_path is not None:
+            for path in (parquet_path, f"{parquet_path}.attempts"):
+                if os.path.exists(path):
+                    os.remove(path)
+        
     except Exception as e:
         logger.error(f"❌ Error loading data to database: {e}")
         raise
@@ -157,11 +550,7 @@ def main():
     """Main ETL function"""
     
     # Get database connection
-    pg_dsn = os.getenv('PG_DSN')
-    if not pg_dsn:
-        raise ValueError("PG_DSN environment variable not set")
-    
-    engine = create_engine(pg_dsn)
+    engine = get_engine()
     
     # Define symbols to track
     symbols = [
@@ -174,21 +563,39 @@ def main():
     logger.info("🚀 Starting price data ETL process")
     
     try:
+        # Earlier runs that fetched but failed to load are finished from
+        # their staged frames before the regular fetch
+        resume_pending_runs(engine)
+        
+        run_id = datetime.now().strftime('%Y%m%dT%H%M%S')
+        
         # Fetch data for different time periods
         # Intraday data (last 5 days with 1-hour intervals)
         logger.info("Fetching intraday data...")
         intraday_data = get_price_data(symbols, period="5d", interval="1h")
         
-        # Daily data (last 3 months)
+        # Daily data (last 3 months, or only since the latest stored day)
         logger.info("Fetching daily data...")
-        daily_data = get_price_data(symbols, period="3mo", interval="1d")
+        daily_data = get_price_data(symbols, period="3mo", interval="1d", last_loaded=get_last_loaded_dates(engine))
         
-        # Combine and deduplicate
-        all_data = pd.concat([intraday_data, daily_data], ignore_index=True)
-        all_data = all_data.drop_duplicates(subset=['symbol', 'date'], keep='last')
+        # Combine and deduplicate: one concat over the non-empty frames (never
+        # concat inside a loop, which re-copies everything per step). Each
+        # frame carries an explicit priority and a stable sort puts the
+        # preferred source last, so keep='last' picks the full daily bar over
+        # intraday bars both here and in the per-day dedup at load time
+        frames = [frame.assign(_prio=prio)
+                  for frame, prio in ((intraday_data, 0), (daily_data, 1)) if not frame.empty]
+        if frames:
+            all_data = pd.concat(frames, ignore_index=True, sort=False)
+            all_data = all_data.sort_values(['symbol', '_prio', 'date'], kind='mergesort')
+            all_data = all_data.drop_duplicates(subset=['symbol', 'date'], keep='last', ignore_index=True)
+            all_data = all_data.drop(columns='_prio')
+            stage_price_data(all_data, run_id)
+        else:
+            all_data = pd.DataFrame()
         
         # Load to database
-        load_prices_to_db(all_data, engine)
+        load_prices_to_db(all_data, engine, run_id=run_id)
         
         logger.info("✅ Price data ETL completed successfully")
         
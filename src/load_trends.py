@@ -3,14 +3,20 @@ ETL script for loading Google Trends data using pytrends
 Fetches search interest trends for market-related keywords
 """
 
-import os
 import pandas as pd
-from sqlalchemy import create_engine, text
 from datetime import datetime, timedelta
 import logging
+from psycopg2.extensions import AsIs, register_adapter
+from psycopg2.extras import execute_values
 from pytrends.request import TrendReq
+from pytrends.exceptions import ResponseError
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 import time
+import threading
 from dotenv import load_dotenv
+from db import get_engine
 
 # Load environment variables
 load_dotenv()
@@ -19,66 +25,250 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def get_trends_data(keywords, geo='US', timeframe='today 3-m'):
+# Bind pandas' NA (used by Arrow-backed columns for missing values) as NULL
+register_adapter(type(pd.NA), lambda _: AsIs('NULL'))
+
+# Request pacing for Google Trends: at most TRENDS_MAX_PER_MINUTE calls in
+# any 60 s window, with an adaptive gap between calls that shrinks
+# additively on success and doubles on 429/5xx (AIMD)
+TRENDS_MAX_PER_MINUTE = 30
+TRENDS_MIN_INTERVAL = 0.5
+TRENDS_MAX_INTERVAL = 60.0
+TRENDS_INTERVAL_STEP = 0.25
+TRENDS_MAX_RETRIES = 3
+
+# Requests in flight at once; Google rate-limits aggressively, so this
+# stays small and the throttle still decides the actual spacing
+TRENDS_CONCURRENCY = 3
+
+class RequestThrottle:
+    """Sliding-window rate limiter with AIMD spacing between requests"""
+    
+    def __init__(self, max_per_minute=TRENDS_MAX_PER_MINUTE, min_interval=TRENDS_MIN_INTERVAL,
+                 max_interval=TRENDS_MAX_INTERVAL, step=TRENDS_INTERVAL_STEP):
+        self.max_per_minute = max_per_minute
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.step = step
+        self.interval = min_interval
+        self._sent = deque()
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """Block until the next request is allowed, then record it"""
+        # Held while sleeping so concurrent workers queue up behind the gap
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] >= 60:
+                self._sent.popleft()
+            
+            delay = 0.0
+            if len(self._sent) >= self.max_per_minute:
+                delay = 60 - (now - self._sent[0])
+            if self._sent:
+                delay = max(delay, self.interval - (now - self._sent[-1]))
+            if delay > 0:
+                time.sleep(delay)
+            
+            self._sent.append(time.monotonic())
+    
+    def success(self):
+        """Additive increase of the request rate"""
+        with self._lock:
+            self.interval = max(self.min_interval, self.interval - self.step)
+    
+    def backoff(self, retry_after=None):
+        """Multiplicative decrease of the request rate, honouring Retry-After"""
+        with self._lock:
+            self.interval = min(self.max_interval, max(self.interval * 2, retry_after or 0))
+
+_TRENDS_THROTTLE = RequestThrottle()
+
+_PYTRENDS_LOCAL = threading.local()
+
+def _get_pytrends():
     """
-    Fetch Google Trends data for given keywords
+    Get this thread's pytrends client
+    
+    TrendReq() performs a cookie-bootstrap request to Google when it is
+    constructed, so each worker thread builds one client and reuses it for
+    all of its requests. Clients are not shared between threads because
+    build_payload() keeps the current query on the instance.
+    
+    Returns:
+        TrendReq: pytrends client owned by the calling thread
+    """
+    client = getattr(_PYTRENDS_LOCAL, 'client', None)
+    if client is None:
+        client = _PYTRENDS_LOCAL.client = TrendReq(hl='en-US', tz=360)
+    return client
+
+def _retry_after_seconds(response):
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date
     
     Args:
-        keywords (list): List of keywords to search
-        geo (str): Geographic region (US, GB, etc.)
-        timeframe (str): Time period for trends data
+        response: HTTP response (may be None)
     
     Returns:
-        pd.DataFrame: Trends data with columns [keyword, date, score, geo]
+        float or None: Seconds to wait, None if the header is absent or invalid
     """
-    pytrends = TrendReq(hl='en-US', tz=360)
-    all_data = []
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _fetch_interest(pytrends, batch, timeframe, geo, throttle=_TRENDS_THROTTLE):
+    """
+    Fetch interest over time for one keyword batch, retrying on 429/5xx
     
-    # Process keywords in batches to avoid rate limits
-    batch_size = 5
-    for i in range(0, len(keywords), batch_size):
-        batch = keywords[i:i+batch_size]
-        
+    Args:
+        pytrends (TrendReq): This thread's pytrends client
+        batch (list): Up to five keywords
+        timeframe (str): Time period for trends data
+        geo (str): Geographic region
+        throttle (RequestThrottle): Rate limiter shared by all requests
+    
+    Returns:
+        pd.DataFrame: pytrends interest_over_time() frame
+    """
+    for attempt in range(TRENDS_MAX_RETRIES + 1):
+        throttle.wait()
         try:
-            logger.info(f"Fetching trends for batch: {batch}")
-            
-            # Build payload
             pytrends.build_payload(batch, cat=0, timeframe=timeframe, geo=geo, gprop='')
-            
-            # Get interest over time
             interest_df = pytrends.interest_over_time()
+            throttle.success()
+            return interest_df
             
-            if interest_df.empty:
-                logger.warning(f"No trends data found for batch: {batch}")
-                continue
+        except ResponseError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status != 429 and (status is None or status < 500):
+                raise
             
-            # Process each keyword
-            for keyword in batch:
-                if keyword in interest_df.columns:
-                    keyword_data = pd.DataFrame({
-                        'keyword': keyword,
-                        'date': interest_df.index.date,
-                        'score': interest_df[keyword].values,
-                        'geo': geo
-                    })
-                    
-                    all_data.append(keyword_data)
-                    logger.info(f"✅ Successfully fetched {len(keyword_data)} records for {keyword}")
-                else:
-                    logger.warning(f"Keyword {keyword} not found in trends data")
+            retry_after = _retry_after_seconds(e.response)
+            throttle.backoff(retry_after)
+            if attempt == TRENDS_MAX_RETRIES:
+                raise
             
-            # Rate limiting
-            time.sleep(2)
+            logger.warning(f"Google Trends returned {status} for {batch}; "
+                           f"retrying in {throttle.interval:.1f}s")
+
+def _fetch_batch(batch, timeframe, geo):
+    """
+    Fetch one keyword batch for one timeframe
+    
+    Args:
+        batch (list): Up to five keywords
+        timeframe (str): Time period for trends data
+        geo (str): Geographic region
+    
+    Returns:
+        list: One DataFrame [keyword, date, score, geo] per keyword found
+    """
+    logger.info(f"Fetching trends for batch: {batch} ({timeframe})")
+    
+    # Build payload and get interest over time, paced by the shared throttle
+    interest_df = _fetch_interest(_get_pytrends(), batch, timeframe, geo)
+    
+    if interest_df.empty:
+        logger.warning(f"No trends data found for batch: {batch}")
+        return []
+    
+    frames = []
+    
+    # Process each keyword
+    for keyword in batch:
+        if keyword in interest_df.columns:
+            keyword_data = pd.DataFrame({
+                'keyword': keyword,
+                'date': interest_df.index.date,
+                'score': interest_df[keyword].values,
+                'geo': geo
+            })
             
-        except Exception as e:
-            logger.error(f"❌ Error fetching trends for batch {batch}: {e}")
-            continue
+            frames.append(keyword_data)
+            logger.info(f"✅ Successfully fetched {len(keyword_data)} records for {keyword}")
+        else:
+            logger.warning(f"Keyword {keyword} not found in trends data")
+    
+    return frames
+
+def get_trends_data(keywords, geo='US', timeframe='today 3-m', max_workers=TRENDS_CONCURRENCY):
+    """
+    Fetch Google Trends data for given keywords
+    
+    Every (timeframe, batch) request is submitted to one small worker pool,
+    so request latency overlaps instead of adding up; the shared throttle
+    still spaces the calls. Results are concatenated in submission order
+    (timeframe, then batch), so later timeframes win a keep='last' dedup.
+    
+    Args:
+        keywords (list): List of keywords to search
+        geo (str): Geographic region (US, GB, etc.)
+        timeframe (str or list): Time period for trends data, or several
+        max_workers (int): Maximum number of requests in flight
+    
+    Returns:
+        pd.DataFrame: Trends data with columns [keyword, date, score, geo]
+    """
+    timeframes = [timeframe] if isinstance(timeframe, str) else list(timeframe)
+    
+    # Process keywords in batches of five, the pytrends payload limit
+    batch_size = 5
+    batches = [keywords[i:i+batch_size] for i in range(0, len(keywords), batch_size)]
+    
+    all_data = []
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='trends') as executor:
+        futures = [((batch, tf), executor.submit(_fetch_batch, batch, tf, geo))
+                   for tf in timeframes for batch in batches]
+        
+        for (batch, tf), future in futures:
+            try:
+                all_data.extend(future.result())
+                
+            except Exception as e:
+                logger.error(f"❌ Error fetching trends for batch {batch} ({tf}): {e}")
+                continue
     
     if all_data:
         return pd.concat(all_data, ignore_index=True)
     else:
         return pd.DataFrame()
 
+def _prepare_trends_df(df):
+    """
+    Cast a trends frame to database-ready values in one vectorized pass
+    
+    Columns become Arrow-backed, which represent missing values natively as
+    pd.NA (bound as NULL by the adapter registered above), so itertuples
+    yields plain tuples with no per-cell conversion.
+    
+    Args:
+        df (pd.DataFrame): Trends data as returned by get_trends_data
+    
+    Returns:
+        pd.DataFrame: Arrow-backed frame [keyword, date, score, geo], one row per key
+    """
+    frame = df[['keyword', 'date', 'score', 'geo']]
+    
+    # A multi-row upsert cannot touch the same row twice
+    frame = frame.drop_duplicates(subset=['keyword', 'date', 'geo'], keep='last')
+    
+    return frame.astype({
+        'keyword': 'string[pyarrow]',
+        'date': 'date32[pyarrow]',
+        'score': 'int64[pyarrow]',
+        'geo': 'string[pyarrow]'
+    })
+
 def load_trends_to_db(df, engine):
     """
     Load trends data to PostgreSQL database using upsert
@@ -91,28 +281,32 @@ def load_trends_to_db(df, engine):
         logger.warning("No data to load")
         return
     
+    upsert_sql = """
+        INSERT INTO f_trends (keyword, date, score, geo)
+        VALUES %s
+        ON CONFLICT (keyword, date, geo) 
+        DO UPDATE SET 
+            score = EXCLUDED.score,
+            created_at = CURRENT_TIMESTAMP
+    """
+    
     try:
-        with engine.connect() as conn:
-            for _, row in df.iterrows():
-                upsert_sql = text("""
-                    INSERT INTO f_trends (keyword, date, score, geo)
-                    VALUES (:keyword, :date, :score, :geo)
-                    ON CONFLICT (keyword, date, geo) 
-                    DO UPDATE SET 
-                        score = EXCLUDED.score,
-                        created_at = CURRENT_TIMESTAMP
-                """)
-                
-                conn.execute(upsert_sql, {
-                    'keyword': row['keyword'],
-                    'date': row['date'],
-                    'score': int(row['score']) if pd.notna(row['score']) else None,
-                    'geo': row['geo']
-                })
-            
-            conn.commit()
-            logger.info(f"✅ Successfully loaded {len(df)} trends records to database")
-            
+        rows = list(_prepare_trends_df(df).itertuples(index=False, name=None))
+        
+        raw_conn = engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cur:
+                # One multi-row INSERT ... ON CONFLICT per 1000-row page
+                execute_values(cur, upsert_sql, rows, page_size=1000)
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+        
+        logger.info(f"✅ Successfully loaded {len(df)} trends records to database")
+        
     except Exception as e:
         logger.error(f"❌ Error loading data to database: {e}")
         raise
@@ -121,11 +315,7 @@ def main():
     """Main ETL function"""
     
     # Get database connection
-    pg_dsn = os.getenv('PG_DSN')
-    if not pg_dsn:
-        raise ValueError("PG_DSN environment variable not set")
-    
-    engine = create_engine(pg_dsn)
+    engine = get_engine()
     
     # Define market-related keywords to track
     keywords = [
@@ -175,21 +365,11 @@ def main():
             'now 7-d'     # Last 7 days
         ]
         
-        all_trends_data = []
-        
-        for timeframe in timeframes:
-            logger.info(f"Fetching trends for timeframe: {timeframe}")
-            trends_data = get_trends_data(keywords, geo='US', timeframe=timeframe)
-            
-            if not trends_data.empty:
-                all_trends_data.append(trends_data)
-            
-            # Rate limiting between timeframes
-            time.sleep(5)
+        # One fan-out over every (timeframe, batch) request
+        combined_data = get_trends_data(keywords, geo='US', timeframe=timeframes)
         
         # Combine all data
-        if all_trends_data:
-            combined_data = pd.concat(all_trends_data, ignore_index=True)
+        if not combined_data.empty:
             # Remove duplicates, keeping the most recent data
             combined_data = combined_data.drop_duplicates(subset=['keyword', 'date', 'geo'], keep='last')
             
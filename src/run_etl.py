@@ -6,6 +6,8 @@ Coordinates all data loading processes
 import os
 import logging
 from datetime import datetime
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Import ETL modules
@@ -13,6 +15,7 @@ from load_prices import main as load_prices_main
 from load_fred import main as load_fred_main
 from load_trends import main as load_trends_main
 from load_news_sentiment import main as load_news_main
+from config import get_performance_logger
 
 # Load environment variables
 load_dotenv()
@@ -28,8 +31,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _run_module(module_name, module_func):
+    """
+    Run one ETL module and record its outcome
+    
+    Executed in a worker process; the performance log is written by the
+    parent so only one process appends to it.
+    
+    Args:
+        module_name (str): Display name of the module
+        module_func (callable): The module's main() entry point
+    
+    Returns:
+        dict: Status plus duration (on success) or error message (on failure)
+    """
+    try:
+        logger.info(f"📊 Starting {module_name} ETL...")
+        module_start = datetime.now()
+        
+        module_func()
+        
+        module_duration = datetime.now() - module_start
+        logger.info(f"✅ {module_name} ETL completed in {module_duration.total_seconds():.2f} seconds")
+        
+        return {
+            'status': 'success',
+            'duration': module_duration.total_seconds()
+        }
+        
+    except Exception as e:
+        logger.error(f"❌ {module_name} ETL failed: {e}")
+        return {
+            'status': 'failed',
+            'error': str(e)
+        }
+
 def run_etl_pipeline():
-    """Run the complete ETL pipeline"""
+    """
+    Run the complete ETL pipeline
+    
+    The modules share no data, so each runs in its own worker process:
+    network waits overlap and CPU-bound work (VADER scoring, pandas
+    reshaping) no longer contends for one GIL, making total wall time
+    roughly that of the slowest module. Log lines carry the emitting
+    module's logger name, which keeps the interleaved output attributable.
+    """
+    perf_logger = get_performance_logger()
     
     logger.info("🚀 Starting Real-Time Market Dashboard ETL Pipeline")
     start_time = datetime.now()
@@ -44,35 +91,38 @@ def run_etl_pipeline():
         ("News Sentiment", load_news_main)
     ]
     
-    results = {}
-    
-    for module_name, module_func in etl_modules:
-        try:
-            logger.info(f"📊 Starting {module_name} ETL...")
-            module_start = datetime.now()
+    # spawn gives every module a fresh interpreter (and its own engine and
+    # connection pool) on every platform, instead of forking a process that
+    # already runs logging threads
+    completed = {}
+    with ProcessPoolExecutor(max_workers=len(etl_modules), mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {executor.submit(_run_module, module_name, module_func): module_name
+                   for module_name, module_func in etl_modules}
+        
+        for future in as_completed(futures):
+            module_name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. killed or out of memory)
+                logger.error(f"❌ {module_name} ETL worker crashed: {e}")
+                result = {'status': 'failed', 'error': str(e)}
             
-            module_func()
-            
-            module_duration = datetime.now() - module_start
-            results[module_name] = {
-                'status': 'success',
-                'duration': module_duration.total_seconds()
-            }
-            
-            logger.info(f"✅ {module_name} ETL completed in {module_duration.total_seconds():.2f} seconds")
-            
-        except Exception as e:
-            logger.error(f"❌ {module_name} ETL failed: {e}")
-            results[module_name] = {
-                'status': 'failed',
-                'error': str(e)
-            }
+            if result['status'] == 'success':
+                perf_logger.info("module=%s status=success duration=%.3f", module_name, result['duration'])
+            completed[module_name] = result
+    
+    # Report in pipeline order regardless of completion order
+    results = {module_name: completed[module_name] for module_name, _ in etl_modules}
     
     # Summary
     total_duration = datetime.now() - start_time
     successful_modules = sum(1 for r in results.values() if r['status'] == 'success')
     total_modules = len(results)
     
+    perf_logger.info("pipeline status=complete duration=%.3f successful=%d/%d",
+                     total_duration.total_seconds(), successful_modules, total_modules)
+    
     logger.info(f"📈 ETL Pipeline Summary:")
     logger.info(f"   Total Duration: {total_duration.total_seconds():.2f} seconds")
     logger.info(f"   Successful Modules: {successful_modules}/{total_modules}")
@@ -3,27 +3,22 @@ Database schema setup for Real-Time Market Dashboard
 Creates all necessary tables for the data warehouse
 """
 
-import os
-import psycopg2
-from sqlalchemy import create_engine, text
+from psycopg2.extras import execute_values
+from sqlalchemy import inspect, text
 from dotenv import load_dotenv
+from db import get_engine
 
 # Load environment variables
 load_dotenv()
 
-def create_database_schema():
-    """Create the complete database schema"""
-    
-    # Get database connection string
-    pg_dsn = os.getenv('PG_DSN')
-    if not pg_dsn:
-        raise ValueError("PG_DSN environment variable not set")
-    
-    # Create SQLAlchemy engine
-    engine = create_engine(pg_dsn)
-    
-    # Schema creation SQL
-    schema_sql = """
+# Tables the schema creates; if all exist the DDL is skipped
+EXPECTED_TABLES = frozenset({
+    'dim_symbol', 'dim_indicator', 'f_price_daily', 'f_price_daily_stage',
+    'f_macro', 'f_macro_stage', 'f_trends', 'f_news_sentiment'
+})
+
+# Schema creation SQL, sent as a single multi-statement execution
+SCHEMA_SQL = """
     -- Dimension Tables
     
     -- Symbols dimension
@@ -63,6 +58,21 @@ def create_database_schema():
         UNIQUE(symbol, date)
     );
     
+    -- Unlogged staging table for COPY-based price loads
+    CREATE UNLOGGED TABLE IF NOT EXISTS f_price_daily_stage (
+        symbol VARCHAR(20),
+        date DATE,
+        open DECIMAL(12,4),
+        high DECIMAL(12,4),
+        low DECIMAL(12,4),
+        close DECIMAL(12,4),
+        adj_close DECIMAL(12,4),
+        volume BIGINT,
+        dividends DECIMAL(12,4),
+        stock_splits DECIMAL(12,4),
+        capital_gains DECIMAL(12,4)
+    );
+    
     -- Macroeconomic indicators
     CREATE TABLE IF NOT EXISTS f_macro (
         id SERIAL PRIMARY KEY,
@@ -73,6 +83,13 @@ def create_database_schema():
         UNIQUE(indicator_id, date)
     );
     
+    -- Unlogged staging table for COPY-based macro loads
+    CREATE UNLOGGED TABLE IF NOT EXISTS f_macro_stage (
+        indicator_id VARCHAR(50),
+        date DATE,
+        value DECIMAL(15,6)
+    );
+    
     -- Google Trends data
     CREATE TABLE IF NOT EXISTS f_trends (
         id SERIAL PRIMARY KEY,
@@ -108,9 +125,18 @@ def create_database_schema():
     CREATE INDEX IF NOT EXISTS idx_trends_keyword_date ON f_trends(keyword, date);
     CREATE INDEX IF NOT EXISTS idx_news_sentiment_symbol ON f_news_sentiment(symbol);
     CREATE INDEX IF NOT EXISTS idx_news_sentiment_fetched_at ON f_news_sentiment(fetched_at);
-    
-    -- Insert default symbols (all symbols used in ETL scripts)
-    INSERT INTO dim_symbol (symbol, name, sector) VALUES
+"""
+
+# The upserts into f_macro rely on a unique (indicator_id, date) index. This
+# is the name PostgreSQL gives the schema's UNIQUE constraint, so it is a
+# no-op on fresh schemas and only adds the index to older f_macro tables
+MACRO_UNIQUE_INDEX_SQL = """
+    CREATE UNIQUE INDEX IF NOT EXISTS f_macro_indicator_id_date_key
+    ON f_macro (indicator_id, date)
+"""
+
+# Default symbols (all symbols used in ETL scripts)
+DEFAULT_SYMBOLS = [
     ('SPY', 'SPDR S&P 500 ETF Trust', 'Broad Market'),
     ('QQQ', 'Invesco QQQ Trust', 'Technology'),
     ('IWM', 'iShares Russell 2000 ETF', 'Small Cap'),
@@ -127,11 +153,11 @@ def create_database_schema():
     ('XLB', 'Materials Select Sector SPDR Fund', 'Materials'),
     ('XLRE', 'Real Estate Select Sector SPDR Fund', 'Real Estate'),
     ('^VIX', 'CBOE Volatility Index', 'Volatility'),
-    ('VIX', 'CBOE Volatility Index', 'Volatility')  -- For news sentiment script
-    ON CONFLICT (symbol) DO NOTHING;
-    
-    -- Insert default indicators (all indicators used in FRED ETL script)
-    INSERT INTO dim_indicator (indicator_id, name, frequency, description) VALUES
+    ('VIX', 'CBOE Volatility Index', 'Volatility')  # For news sentiment script
+]
+
+# Default indicators (all indicators used in FRED ETL script)
+DEFAULT_INDICATORS = [
     ('CPIAUCSL', 'Consumer Price Index for All Urban Consumers: All Items', 'Monthly', 'Inflation measure'),
     ('UNRATE', 'Unemployment Rate', 'Monthly', 'Labor market indicator'),
     ('FEDFUNDS', 'Federal Funds Effective Rate', 'Daily', 'Monetary policy rate'),
@@ -152,26 +178,55 @@ def create_database_schema():
     ('RECPROUSM156N', 'Recession Probabilities', 'Monthly', 'Recession probability model'),
     ('T10Y2Y', '10-Year Treasury Constant Maturity Minus 2-Year Treasury Constant Maturity', 'Daily', 'Yield curve spread'),
     ('T10Y3M', '10-Year Treasury Constant Maturity Minus 3-Month Treasury Constant Maturity', 'Daily', 'Yield curve spread')
-    ON CONFLICT (indicator_id) DO NOTHING;
+]
+
+def seed_dimensions(engine):
     """
+    Insert the default symbols and indicators, one round trip per table
     
+    Args:
+        engine: SQLAlchemy engine
+    """
+    raw_conn = engine.raw_connection()
     try:
-        with engine.connect() as conn:
-            # Execute schema creation
-            conn.execute(text(schema_sql))
-            conn.commit()
+        with raw_conn.cursor() as cur:
+            execute_values(cur, "INSERT INTO dim_symbol (symbol, name, sector) VALUES %s ON CONFLICT (symbol) DO NOTHING",
+                           DEFAULT_SYMBOLS)
+            execute_values(cur, "INSERT INTO dim_indicator (indicator_id, name, frequency, description) VALUES %s ON CONFLICT (indicator_id) DO NOTHING",
+                           DEFAULT_INDICATORS)
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+def create_database_schema():
+    """Create the complete database schema"""
+    
+    # Get the shared SQLAlchemy engine
+    engine = get_engine()
+    
+    try:
+        # Skip the DDL entirely when every table is already there
+        existing = set(inspect(engine).get_table_names())
+        if EXPECTED_TABLES <= existing:
+            print("✅ Database schema already present, skipping DDL")
+        else:
+            with engine.begin() as conn:
+                conn.execute(text(SCHEMA_SQL))
             print("✅ Database schema created successfully!")
             
-            # Verify tables were created
-            result = conn.execute(text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                ORDER BY table_name
-            """))
-            
-            tables = [row[0] for row in result]
-            print(f"📊 Created tables: {', '.join(tables)}")
+            existing = set(inspect(engine).get_table_names())
+            print(f"📊 Created tables: {', '.join(sorted(existing))}")
+        
+        with engine.begin() as conn:
+            conn.execute(text(MACRO_UNIQUE_INDEX_SQL))
+        
+        # Seeds are idempotent and cheap, so they always run; this keeps the
+        # dimensions in step with newly added symbols and indicators
+        seed_dimensions(engine)
+        print("✅ Default symbols and indicators seeded")
             
     except Exception as e:
         print(f"❌ Error creating schema: {e}")
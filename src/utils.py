@@ -5,12 +5,415 @@ Common calculations and helper functions for the dashboard
 
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from functools import cached_property
+from typing import List, Dict, NamedTuple, Optional, Tuple, Union
 import logging
 
+# numba is optional: without it the kernels below run as plain Python loops,
+# which is slow but gives the same results
+try:
+    from numba import njit, guvectorize, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function uncompiled"""
+        return lambda func: func
+    
+    def guvectorize(*args, **kwargs):
+        """Stand-in for numba.guvectorize that loops the kernel over rows"""
+        def decorator(func):
+            def gufunc(x, *params):
+                out = np.empty(x.shape)
+                for row in np.ndindex(x.shape[:-1]):
+                    func(x[row], *params, out[row])
+                return out
+            return gufunc
+        return decorator
+
+# numexpr is optional too: it evaluates elementwise expressions in one
+# threaded pass without temporaries, with plain NumPy as the fallback
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Kernel signatures are given explicitly so every kernel compiles (or loads
+# from numba's on-disk cache) at import, not on its first call. Inputs are
+# typed read-only: pandas hands out read-only array views, and writable
+# arrays convert to read-only ones
+if NUMBA_AVAILABLE:
+    _F8_IN = types.Array(types.float64, 1, 'A', readonly=True)
+    _F4_IN = types.Array(types.float32, 1, 'A', readonly=True)
+    _INTP_IN = types.Array(types.intp, 1, 'A', readonly=True)
+    _F8_OUT = types.float64[:]
+    
+    _ROLLING_SIG = _F8_OUT(_F8_IN, types.int64)
+    _SERIES_SIG = _F8_OUT(_F8_IN)
+    _SEGMENT_ROLLING_SIG = types.void(_F8_IN, types.intp, types.intp, types.int64, _F8_OUT)
+    _GROUPED_ROLLING_SIG = types.void(_F8_IN, _INTP_IN, _INTP_IN, types.int64, _F8_OUT)
+    _MEAN_STD_SIG = types.UniTuple(types.float64, 2)(_F8_IN)
+    _PAIR_SIG = [types.float64(_F8_IN, _F8_IN), types.float64(_F4_IN, _F4_IN)]
+    _GROUPED_SERIES_SIG = types.void(_F8_IN, _INTP_IN, _F8_OUT)
+else:
+    _ROLLING_SIG = _SERIES_SIG = _SEGMENT_ROLLING_SIG = _GROUPED_ROLLING_SIG = None
+    _MEAN_STD_SIG = _PAIR_SIG = _GROUPED_SERIES_SIG = None
+
+@njit(_ROLLING_SIG, cache=True)
+def _rolling_std(x, window):
+    """
+    Rolling sample standard deviation in one pass (Welford add/remove updates)
+    
+    A window containing NaN, or fewer than `window` values so far, yields NaN,
+    matching pandas' rolling(window).std().
+    
+    Args:
+        x: float64 array
+        window: Rolling window size
+    
+    Returns:
+        float64 array of the same length as x
+    """
+    n_obs = len(x)
+    out = np.empty(n_obs)
+    count = 0
+    nan_count = 0
+    mean = 0.0
+    m2 = 0.0
+    
+    for i in range(n_obs):
+        # Add the new value
+        val = x[i]
+        if np.isnan(val):
+            nan_count += 1
+        else:
+            count += 1
+            delta = val - mean
+            mean += delta / count
+            m2 += delta * (val - mean)
+        
+        # Drop the value leaving the window
+        if i >= window:
+            old = x[i - window]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                count -= 1
+                if count == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = old - mean
+                    mean -= delta / count
+                    m2 -= delta * (old - mean)
+        
+        if i < window - 1 or nan_count > 0 or count < 2:
+            out[i] = np.nan
+        else:
+            out[i] = np.sqrt(max(m2, 0.0) / (count - 1))
+    
+    return out
+
+@njit(_SERIES_SIG, cache=True, error_model='numpy')
+def _rolling_drawdown(x):
+    """
+    Drawdown from the running maximum in one forward pass, without
+    materializing the running-maximum array
+    
+    NaN prices are skipped by the running maximum and give NaN drawdowns,
+    matching pandas' expanding().max().
+    
+    Args:
+        x: float64 array of prices
+    
+    Returns:
+        float64 array of the same length as x
+    """
+    out = np.empty(len(x))
+    peak = np.nan
+    
+    for i in range(len(x)):
+        val = x[i]
+        if val > peak or (np.isnan(peak) and not np.isnan(val)):
+            peak = val
+        out[i] = (val - peak) / peak
+    
+    return out
+
+@njit(_SEGMENT_ROLLING_SIG, cache=True)
+def _roll_mean_segment(values, start, end, window, out):
+    """
+    Rolling mean over values[start:end] using a running sum
+    
+    As with pandas' rolling(window).mean(), a window containing NaN or a
+    partial window yields NaN.
+    
+    Args:
+        values: float64 array
+        start: Segment start offset
+        end: Segment end offset (exclusive)
+        window: Rolling window size
+        out: float64 array receiving the result at the same offsets
+    """
+    total = 0.0
+    nan_count = 0
+    
+    for i in range(start, end):
+        val = values[i]
+        if np.isnan(val):
+            nan_count += 1
+        else:
+            total += val
+        
+        if i - start >= window:
+            old = values[i - window]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                total -= old
+        
+        if i - start < window - 1 or nan_count > 0:
+            out[i] = np.nan
+        else:
+            out[i] = total / window
+
+@njit(_GROUPED_ROLLING_SIG, cache=True)
+def _grouped_roll_mean(values, starts, ends, window, out):
+    """
+    Rolling mean restarted at every group boundary
+    
+    Args:
+        values: float64 array sorted by group
+        starts: Segment start offsets
+        ends: Segment end offsets (exclusive)
+        window: Rolling window size
+        out: float64 array receiving the result
+    """
+    for g in range(len(starts)):
+        _roll_mean_segment(values, starts[g], ends[g], window, out)
+
+@guvectorize(['void(float64[:], int64, float64[:])'], '(n),()->(n)', target='parallel', cache=True)
+def _roll_mean_gu(x, window, out):
+    """
+    Rolling mean along the last axis, computed for all rows in parallel
+    
+    Args:
+        x: float64 array, one group per row
+        window: Rolling window size
+        out: float64 array receiving the result
+    """
+    _roll_mean_segment(x, 0, len(x), window, out)
+
+@njit(_MEAN_STD_SIG, cache=True)
+def _mean_std(x):
+    """
+    Mean and sample standard deviation in one pass (Welford's algorithm)
+    
+    NaN values are skipped, as in pandas' mean() and std().
+    
+    Args:
+        x: float64 array
+    
+    Returns:
+        Tuple of (mean, std); NaN when there are too few values
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    
+    for i in range(len(x)):
+        val = x[i]
+        if not np.isnan(val):
+            count += 1
+            delta = val - mean
+            mean += delta / count
+            m2 += delta * (val - mean)
+    
+    if count == 0:
+        return np.nan, np.nan
+    if count == 1:
+        return mean, np.nan
+    return mean, np.sqrt(m2 / (count - 1))
+
+@njit(_PAIR_SIG, cache=True, error_model='numpy')
+def _beta(asset, market):
+    """
+    Beta of asset on market from one pass of online co-moment updates
+    
+    Args:
+        asset: float64 array of asset returns, without NaN
+        market: float64 array of market returns, same length, without NaN
+    
+    Returns:
+        cov(asset, market) / var(market); NaN with fewer than two observations
+    """
+    asset_mean = 0.0
+    market_mean = 0.0
+    comoment = 0.0
+    market_m2 = 0.0
+    
+    for i in range(len(asset)):
+        n_obs = i + 1
+        asset_delta = asset[i] - asset_mean
+        asset_mean += asset_delta / n_obs
+        market_delta = market[i] - market_mean
+        market_mean += market_delta / n_obs
+        
+        # Both use the updated market mean, so the ddof terms cancel in the ratio
+        market_resid = market[i] - market_mean
+        comoment += asset_delta * market_resid
+        market_m2 += market_delta * market_resid
+    
+    if len(asset) < 2:
+        return np.nan
+    return comoment / market_m2
+
+@njit(_GROUPED_SERIES_SIG, cache=True, error_model='numpy')
+def _grp_pct_change(values, codes, out):
+    """
+    Percentage change to the previous row of the same group
+    
+    Rows must be grouped contiguously by code; the first row of every group
+    gets NaN, as with groupby().pct_change().
+    
+    Args:
+        values: float64 array sorted by group
+        codes: Group codes, aligned with values
+        out: float64 array receiving the result
+    """
+    for i in range(len(values)):
+        if i == 0 or codes[i] != codes[i - 1]:
+            out[i] = np.nan
+        else:
+            out[i] = values[i] / values[i - 1] - 1.0
+
+@njit(_GROUPED_SERIES_SIG, cache=True)
+def _grp_diff(values, codes, out):
+    """
+    Difference to the previous row of the same group
+    
+    Rows must be grouped contiguously by code; the first row of every group
+    gets NaN, as with groupby().diff().
+    
+    Args:
+        values: float64 array sorted by group
+        codes: Group codes, aligned with values
+        out: float64 array receiving the result
+    """
+    for i in range(len(values)):
+        if i == 0 or codes[i] != codes[i - 1]:
+            out[i] = np.nan
+        else:
+            out[i] = values[i] - values[i - 1]
+
+class _GroupedArrays(NamedTuple):
+    """
+    Contiguous struct-of-arrays form of one value column grouped by a key
+    
+    Rows with a missing key are left out; group g occupies
+    values[group_offsets[g]:group_offsets[g + 1]].
+    """
+    order: np.ndarray          # source row position of each entry
+    codes: np.ndarray          # group code of each entry (intp)
+    values: np.ndarray         # value of each entry (float64)
+    group_offsets: np.ndarray  # segment bounds, one more than the group count (intp)
+    n_rows: int                # row count of the source frame
+
+def _to_soa(df: pd.DataFrame, group_col: str, value_col: str, time_col: Optional[str] = None) -> _GroupedArrays:
+    """
+    Sort and factorize a frame into contiguous per-group arrays
+    
+    Within a group, rows are ordered by time_col (missing times last) or,
+    without one, keep their original order, as in a pandas groupby.
+    
+    Args:
+        df: Source frame
+        group_col: Group key column
+        value_col: Value column
+        time_col: Optional column ordering rows within a group
+    
+    Returns:
+        _GroupedArrays for the frame
+    """
+    codes, _ = pd.factorize(df[group_col])
+    rows = np.flatnonzero(codes >= 0)
+    if time_col is None:
+        order = rows[np.argsort(codes[rows], kind='stable')]
+    else:
+        time_rank = df[time_col].rank(method='first', na_option='bottom').to_numpy()
+        order = rows[np.lexsort((time_rank[rows], codes[rows]))]
+    
+    sorted_codes = codes[order]
+    boundaries = np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1
+    return _GroupedArrays(
+        order=order,
+        codes=sorted_codes,
+        values=np.ascontiguousarray(df[value_col].to_numpy(dtype=np.float64, na_value=np.nan)[order]),
+        group_offsets=np.r_[0, boundaries, len(order)].astype(np.intp),
+        n_rows=len(df)
+    )
+
+def _scatter(values: np.ndarray, soa: _GroupedArrays) -> np.ndarray:
+    """
+    Place per-entry results back at their source rows
+    
+    Args:
+        values: Array aligned with soa.values
+        soa: Grouped arrays the values were computed from
+    
+    Returns:
+        float64 array in source row order, NaN for rows with a missing key
+    """
+    out = np.full(soa.n_rows, np.nan)
+    out[soa.order] = values
+    return out
+
+@dataclass
+class MarketStats:
+    """
+    One price series with its derived arrays computed once and cached
+    
+    Dashboards compute several metrics from the same prices; passing one
+    MarketStats to calculate_volatility, calculate_drawdown,
+    calculate_sharpe_ratio and detect_anomalies shares the returns and
+    their mean/std instead of re-deriving them per call.
+    """
+    prices: np.ndarray
+    index: Optional[pd.Index] = None
+    
+    def __post_init__(self):
+        self.prices = np.asarray(self.prices, dtype=np.float64)
+    
+    @classmethod
+    def from_series(cls, prices: pd.Series) -> 'MarketStats':
+        """Build from a price Series, keeping its index for results"""
+        return cls(prices.to_numpy(dtype=np.float64, na_value=np.nan), prices.index)
+    
+    @cached_property
+    def returns(self) -> np.ndarray:
+        """One-period returns, NaN in the first slot like pct_change()"""
+        returns = np.empty(len(self.prices))
+        returns[:1] = np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(np.diff(self.prices), self.prices[:-1], out=returns[1:])
+        return returns
+    
+    @cached_property
+    def mean_std(self) -> Tuple[float, float]:
+        """Mean and sample standard deviation of the returns"""
+        return _mean_std(self.returns)
+    
+    @cached_property
+    def drawdown(self) -> np.ndarray:
+        """Drawdown of the prices from their running maximum"""
+        return _rolling_drawdown(self.prices)
+
 def calculate_returns(prices: pd.Series, periods: int = 1) -> pd.Series:
     """
     Calculate percentage returns for a price series
@@ -24,73 +427,123 @@ def calculate_returns(prices: pd.Series, periods: int = 1) -> pd.Series:
     """
     return prices.pct_change(periods=periods)
 
-def calculate_volatility(returns: pd.Series, window: int = 20) -> pd.Series:
+def calculate_volatility(returns: Union[pd.Series, MarketStats], window: int = 20) -> pd.Series:
     """
     Calculate rolling volatility (standard deviation)
     
     Args:
-        returns: Returns series
+        returns: Returns series, or MarketStats for the prices
         window: Rolling window size
     
     Returns:
         Volatility series
     """
-    return returns.rolling(window=window).std() * np.sqrt(252)
+    if isinstance(returns, MarketStats):
+        return pd.Series(_rolling_std(returns.returns, window) * np.sqrt(252), index=returns.index)
+    
+    values = np.asarray(returns, dtype=np.float64)
+    return pd.Series(_rolling_std(values, window) * np.sqrt(252), index=returns.index, name=returns.name)
 
-def calculate_drawdown(prices: pd.Series) -> pd.Series:
+def calculate_drawdown(prices: Union[pd.Series, MarketStats]) -> pd.Series:
     """
     Calculate rolling maximum drawdown
     
     Args:
-        prices: Price series
+        prices: Price series, or MarketStats for the prices
     
     Returns:
         Drawdown series (negative values)
     """
-    rolling_max = prices.expanding().max()
-    drawdown = (prices - rolling_max) / rolling_max
-    return drawdown
+    if isinstance(prices, MarketStats):
+        return pd.Series(prices.drawdown, index=prices.index)
+    
+    values = np.asarray(prices, dtype=np.float64)
+    return pd.Series(_rolling_drawdown(values), index=prices.index, name=prices.name)
 
-def calculate_sharpe_ratio(returns: pd.Series, risk_free_rate: float = 0.02) -> float:
+def calculate_sharpe_ratio(returns: Union[pd.Series, MarketStats], risk_free_rate: float = 0.02) -> float:
     """
     Calculate Sharpe ratio
     
     Args:
-        returns: Returns series
+        returns: Returns series, or MarketStats for the prices
         risk_free_rate: Risk-free rate (annual)
     
     Returns:
         Sharpe ratio
     """
-    excess_returns = returns - risk_free_rate / 252
-    return excess_returns.mean() / returns.std() * np.sqrt(252)
+    if isinstance(returns, MarketStats):
+        mean, std = returns.mean_std
+    else:
+        mean, std = _mean_std(np.asarray(returns, dtype=np.float64))
+    return (mean - risk_free_rate / 252) / std * np.sqrt(252)
 
-def calculate_beta(asset_returns: pd.Series, market_returns: pd.Series) -> float:
+def calculate_beta(asset_returns: pd.Series, market_returns: pd.Series, dtype: type = np.float64) -> float:
     """
     Calculate beta coefficient
     
     Args:
         asset_returns: Asset returns
         market_returns: Market returns (e.g., S&P 500)
+        dtype: Array dtype the returns are read as; np.float32 halves the
+            memory traffic (the accumulation stays in float64)
     
     Returns:
         Beta coefficient
     """
-    covariance = np.cov(asset_returns, market_returns)[0, 1]
-    market_variance = np.var(market_returns)
-    return covariance / market_variance
+    asset = np.asarray(asset_returns, dtype=dtype)
+    market = np.asarray(market_returns, dtype=dtype)
+    
+    # Use only the periods where both returns are present
+    valid = ~(np.isnan(asset) | np.isnan(market))
+    if not valid.all():
+        asset, market = asset[valid], market[valid]
+    
+    return _beta(asset, market)
 
-def calculate_correlation_matrix(returns_df: pd.DataFrame) -> pd.DataFrame:
+def calculate_correlation_matrix(returns_df: pd.DataFrame, dtype: type = np.float64) -> pd.DataFrame:
     """
     Calculate correlation matrix for returns
     
     Args:
         returns_df: DataFrame with returns for multiple assets
+        dtype: Computation dtype; np.float32 halves the memory traffic and
+            runs the products as single-precision GEMMs
     
     Returns:
         Correlation matrix
     """
-    return returns_df.corr()
+    values = returns_df.to_numpy(dtype=dtype, na_value=np.nan)
+    valid = ~np.isnan(values)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Centering first keeps the products well conditioned; it does not
+        # change any correlation
+        values = values - np.where(valid, values, 0.0).sum(axis=0) / valid.sum(axis=0).astype(dtype)
+        
+        if valid.all():
+            # Dense data: one GEMM over the centered columns
+            n_obs = len(values)
+            cov = (values.T @ values) / (n_obs - 1)
+            std = np.sqrt(np.diag(cov))
+            corr = cov / np.outer(std, std)
+        else:
+            # Pairwise-complete observations, as pandas does: zero the gaps
+            # and let GEMMs over the masks count and sum only the rows where
+            # both columns are present
+            mask = valid.astype(dtype)
+            filled = np.where(valid, values, 0.0)
+            counts = mask.T @ mask
+            sums = filled.T @ mask
+            squares = (filled * filled).T @ mask
+            cross = filled.T @ filled
+            
+            cov = counts * cross - sums * sums.T
+            var = counts * squares - sums * sums
+            corr = cov / np.sqrt(var * var.T)
+            corr[counts < 2] = np.nan
+    
+    corr = np.clip(corr, -1.0, 1.0)
+    return pd.DataFrame(corr, index=returns_df.columns, columns=returns_df.columns)
 
 def calculate_sector_performance(prices_df: pd.DataFrame, sectors_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -103,52 +556,111 @@ def calculate_sector_performance(prices_df: pd.DataFrame, sectors_df: pd.DataFra
     Returns:
         Sector performance DataFrame
     """
-    # Merge price and sector data
-    merged_df = prices_df.merge(sectors_df, on='symbol', how='left')
-    
-    # Calculate sector performance
-    sector_perf = merged_df.groupby(['sector', 'date']).agg({
-        'close': 'mean',
-        'volume': 'sum'
-    }).reset_index()
-    
-    # Calculate returns by sector
-    sector_perf['sector_return'] = sector_perf.groupby('sector')['close'].pct_change()
+    # Look sectors up per symbol instead of joining; symbols without a
+    # sector get code -1 and are left out, as the groupby dropped them
+    sector_map = dict(zip(sectors_df['symbol'], sectors_df['sector']))
+    sectors = pd.Categorical(prices_df['symbol'].map(sector_map))
+    dates = pd.Categorical(prices_df['date'])
+    n_dates = len(dates.categories)
+    
+    # One integer key per (sector, date); categories are sorted, so key
+    # order is the groupby's (sector, date) order
+    keep = (sectors.codes >= 0) & (dates.codes >= 0)
+    keys = sectors.codes[keep].astype(np.intp) * n_dates + dates.codes[keep]
+    n_keys = len(sectors.categories) * n_dates
+    
+    # Bucketed reductions: mean close over non-missing closes, summed volume
+    close = prices_df['close'].to_numpy(dtype=np.float64, na_value=np.nan)[keep]
+    has_close = ~np.isnan(close)
+    close_sum = np.bincount(keys[has_close], weights=close[has_close], minlength=n_keys)
+    close_count = np.bincount(keys[has_close], minlength=n_keys)
+    volume = prices_df['volume'].to_numpy(dtype=np.float64, na_value=np.nan)[keep]
+    volume_sum = np.bincount(keys, weights=np.nan_to_num(volume), minlength=n_keys)
+    
+    # Keep only the (sector, date) pairs that actually occur
+    groups = np.flatnonzero(np.bincount(keys, minlength=n_keys))
+    sector_codes = groups // n_dates
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        close_mean = close_sum[groups] / close_count[groups]
+    
+    sector_perf = pd.DataFrame({
+        'sector': sectors.categories.take(sector_codes),
+        'date': dates.categories.take(groups % n_dates),
+        'close': close_mean,
+        'volume': volume_sum[groups]
+    })
+    if pd.api.types.is_integer_dtype(prices_df['volume'].dtype):
+        sector_perf['volume'] = sector_perf['volume'].astype(np.int64)
+    
+    # Calculate returns by sector; rows are sorted by sector, so each sector
+    # is one contiguous run
+    sector_return = np.empty(len(sector_perf))
+    _grp_pct_change(close_mean, sector_codes, sector_return)
+    sector_perf['sector_return'] = sector_return
     
     return sector_perf
 
-def calculate_moving_averages(prices: pd.Series, windows: List[int] = [20, 50, 200]) -> pd.DataFrame:
+def calculate_moving_averages(prices: pd.Series, windows: List[int] = [20, 50, 200],
+                              dtype: type = np.float64) -> pd.DataFrame:
     """
     Calculate multiple moving averages
     
     Args:
         prices: Price series
         windows: List of window sizes
+        dtype: Dtype of the moving-average columns; the prefix sums are
+            always float64, since float32 running totals lose precision
     
     Returns:
         DataFrame with moving averages
     """
+    values = np.asarray(prices, dtype=np.float64)
+    missing = np.isnan(values)
+    
+    # One shared pass: prefix sums of the prices (gaps as 0) and of the gap
+    # count, from which every window's sum is a single vector subtraction
+    csum = np.zeros(len(values) + 1)
+    np.cumsum(np.where(missing, 0.0, values), out=csum[1:])
+    gaps = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(missing, out=gaps[1:])
+    
     ma_df = pd.DataFrame(index=prices.index)
     ma_df['price'] = prices
     
     for window in windows:
-        ma_df[f'ma_{window}'] = prices.rolling(window=window).mean()
+        ma = np.full(len(values), np.nan, dtype=dtype)
+        if window <= len(values):
+            window_sum = csum[window:] - csum[:-window]
+            # Like rolling().mean(), a window containing a gap is NaN
+            ma[window - 1:] = np.where(gaps[window:] == gaps[:-window], window_sum / window, np.nan)
+        ma_df[f'ma_{window}'] = ma
     
     return ma_df
 
-def detect_anomalies(returns: pd.Series, threshold: float = 3.0) -> pd.Series:
+def detect_anomalies(returns: Union[pd.Series, MarketStats], threshold: float = 3.0) -> pd.Series:
     """
     Detect anomalous returns using z-score
     
     Args:
-        returns: Returns series
+        returns: Returns series, or MarketStats for the prices
         threshold: Z-score threshold for anomaly detection
     
     Returns:
         Boolean series indicating anomalies
     """
-    z_scores = np.abs((returns - returns.mean()) / returns.std())
-    return z_scores > threshold
+    if isinstance(returns, MarketStats):
+        values = returns.returns
+        mean, std = returns.mean_std
+    else:
+        values = np.asarray(returns, dtype=np.float64)
+        mean, std = _mean_std(values)
+    
+    if NUMEXPR_AVAILABLE:
+        anomalies = ne.evaluate('abs((values - mean) / std) > threshold')
+    else:
+        anomalies = np.abs((values - mean) / std) > threshold
+    return pd.Series(anomalies, index=returns.index, name=getattr(returns, 'name', None))
 
 def calculate_sentiment_score(sentiment_df: pd.DataFrame, window: int = 7) -> pd.DataFrame:
     """
@@ -161,12 +673,29 @@ def calculate_sentiment_score(sentiment_df: pd.DataFrame, window: int = 7) -> pd
     Returns:
         DataFrame with sentiment scores
     """
-    sentiment_df = sentiment_df.copy()
-    sentiment_df['sentiment_score'] = sentiment_df.groupby('symbol')['vader_compound'].rolling(
-        window=window
-    ).mean().reset_index(0, drop=True)
-    
-    return sentiment_df
+    # Every symbol as one contiguous, time-ordered segment
+    soa = _to_soa(sentiment_df, 'symbol', 'vader_compound', 'fetched_at')
+    starts, ends = soa.group_offsets[:-1], soa.group_offsets[1:]
+    lengths = ends - starts
+    
+    if len(starts) > 1 and len(starts) * lengths.max() <= 2 * len(soa.values):
+        # Similar-length symbols: lay them out as NaN-padded rows of a
+        # symbol x time array and roll all rows in parallel. Padding trails
+        # each row, so it never enters a real row's window
+        rows = np.repeat(np.arange(len(starts)), lengths)
+        cols = np.arange(len(soa.values)) - np.repeat(starts, lengths)
+        padded = np.full((len(starts), lengths.max()), np.nan)
+        padded[rows, cols] = soa.values
+        scores = _roll_mean_gu(padded, window)[rows, cols]
+    else:
+        # Very uneven symbols would be mostly padding; roll the contiguous
+        # segments in one sequential pass instead
+        scores = np.empty(len(soa.values))
+        _grouped_roll_mean(soa.values, starts, ends, window, scores)
+    
+    # Scatter back to the caller's row order; assign shares the existing
+    # columns instead of deep-copying the frame
+    return sentiment_df.assign(sentiment_score=_scatter(scores, soa))
 
 def calculate_trend_strength(trends_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -178,20 +707,34 @@ def calculate_trend_strength(trends_df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with trend strength metrics
     """
-    trends_df = trends_df.copy()
+    # Every keyword as one contiguous segment, in its original row order
+    soa = _to_soa(trends_df, 'keyword', 'score')
     
     # Calculate trend momentum
-    trends_df['trend_momentum'] = trends_df.groupby('keyword')['score'].pct_change()
+    momentum = np.empty(len(soa.values))
+    _grp_pct_change(soa.values, soa.codes, momentum)
     
     # Calculate trend acceleration
-    trends_df['trend_acceleration'] = trends_df.groupby('keyword')['trend_momentum'].diff()
-    
-    # Calculate trend strength (normalized)
-    trends_df['trend_strength'] = trends_df.groupby('keyword')['score'].transform(
-        lambda x: (x - x.min()) / (x.max() - x.min())
+    acceleration = np.empty(len(soa.values))
+    _grp_diff(momentum, soa.codes, acceleration)
+    
+    # Calculate trend strength (normalized) from per-segment min/max;
+    # fmin/fmax skip NaN like groupby min/max
+    strength = np.empty(len(soa.values))
+    if len(soa.values):
+        starts = soa.group_offsets[:-1]
+        group_ids = np.repeat(np.arange(len(starts)), np.diff(soa.group_offsets))
+        score_min = np.fmin.reduceat(soa.values, starts)[group_ids]
+        score_max = np.fmax.reduceat(soa.values, starts)[group_ids]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            strength = (soa.values - score_min) / (score_max - score_min)
+    
+    # assign shares the existing columns instead of deep-copying the frame
+    return trends_df.assign(
+        trend_momentum=_scatter(momentum, soa),
+        trend_acceleration=_scatter(acceleration, soa),
+        trend_strength=_scatter(strength, soa)
     )
-    
-    return trends_df
 
 def calculate_macro_correlations(macro_df: pd.DataFrame, price_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -207,22 +750,33 @@ def calculate_macro_correlations(macro_df: pd.DataFrame, price_df: pd.DataFrame)
     # Calculate market returns
     market_returns = price_df[price_df['symbol'] == 'SPY'].set_index('date')['close'].pct_change()
     
-    # Calculate correlations
-    correlations = []
-    for indicator in macro_df['indicator_id'].unique():
-        indicator_data = macro_df[macro_df['indicator_id'] == indicator].set_index('date')['value']
-        
-        # Align dates and calculate correlation
-        aligned_data = pd.concat([market_returns, indicator_data], axis=1, join='inner')
-        correlation = aligned_data.corr().iloc[0, 1]
-        
-        correlations.append({
-            'indicator_id': indicator,
-            'correlation': correlation,
-            'abs_correlation': abs(correlation)
-        })
+    # One wide date x indicator frame, inner-joined to the market returns
+    wide = macro_df.pivot(index='date', columns='indicator_id', values='value')
+    aligned = wide.join(market_returns.rename('__market__'), how='inner')
     
-    return pd.DataFrame(correlations).sort_values('abs_correlation', ascending=False)
+    # Each indicator is correlated over the dates where both it and the
+    # market have values, so mask per column and center within the mask
+    values = aligned[wide.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    market = aligned['__market__'].to_numpy(dtype=np.float64, na_value=np.nan)[:, None]
+    valid = ~(np.isnan(values) | np.isnan(market))
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        counts = valid.sum(axis=0)
+        values_dev = np.where(valid, values - np.where(valid, values, 0.0).sum(axis=0) / counts, 0.0)
+        market_dev = np.where(valid, market - np.where(valid, market, 0.0).sum(axis=0) / counts, 0.0)
+        
+        cross = np.einsum('ij,ij->j', values_dev, market_dev)
+        values_ss = np.einsum('ij,ij->j', values_dev, values_dev)
+        market_ss = np.einsum('ij,ij->j', market_dev, market_dev)
+        correlation = cross / np.sqrt(values_ss * market_ss)
+    
+    correlations = pd.DataFrame({
+        'indicator_id': wide.columns.to_numpy(),
+        'correlation': correlation,
+        'abs_correlation': np.abs(correlation)
+    })
+    
+    return correlations.sort_values('abs_correlation', ascending=False)
 
 def generate_market_summary(price_df: pd.DataFrame, sentiment_df: pd.DataFrame) -> Dict:
     """
@@ -235,24 +789,33 @@ def generate_market_summary(price_df: pd.DataFrame, sentiment_df: pd.DataFrame)
     Returns:
         Dictionary with market summary metrics
     """
-    latest_date = price_df['date'].max()
-    latest_data = price_df[price_df['date'] == latest_date]
+    # Latest rows from one max and one mask over the raw date array
+    dates = price_df['date'].to_numpy()
+    latest_value = dates.max()
+    latest_date = pd.Timestamp(latest_value)
+    latest_data = price_df.iloc[np.flatnonzero(dates == latest_value)]
     
     # Market performance
     spy_data = latest_data[latest_data['symbol'] == 'SPY']
     market_performance = spy_data['close'].iloc[0] if not spy_data.empty else None
     
-    # Sector performance
-    sector_perf = latest_data.groupby('symbol')['close'].first()
-    
-    # Sentiment summary
-    latest_sentiment = sentiment_df[sentiment_df['fetched_at'].dt.date == latest_date.date()]
+    # Sector performance (one entry per symbol)
+    symbol_count = latest_data['symbol'].nunique()
+    
+    # Sentiment summary: compare against the day's bounds rather than
+    # building a Python date object for every fetched_at
+    fetched_at = sentiment_df['fetched_at']
+    day_start = pd.Timestamp(latest_date.date())
+    if fetched_at.dt.tz is not None:
+        day_start = day_start.tz_localize(fetched_at.dt.tz)
+    day_end = day_start + pd.Timedelta(days=1)
+    latest_sentiment = sentiment_df[(fetched_at >= day_start) & (fetched_at < day_end)]
     avg_sentiment = latest_sentiment['vader_compound'].mean() if not latest_sentiment.empty else None
     
     summary = {
         'date': latest_date,
         'market_performance': market_performance,
-        'sector_count': len(sector_perf),
+        'sector_count': symbol_count,
         'avg_sentiment': avg_sentiment,
         'sentiment_count': len(latest_sentiment),
         'market_status': 'Open' if latest_date.weekday() < 5 else 'Closed'
@@ -280,13 +843,12 @@ def validate_data_quality(df: pd.DataFrame, required_columns: List[str]) -> Dict
     }
     
     # Check required columns
-    missing_cols = [col for col in required_columns if col not in df.columns]
+    columns = set(df.columns)
+    missing_cols = [col for col in required_columns if col not in columns]
     validation_results['missing_columns'] = missing_cols
     
-    # Check null values
-    for col in df.columns:
-        null_count = df[col].isnull().sum()
-        validation_results['null_counts'][col] = null_count
+    # Check null values (one reduction over the whole frame)
+    validation_results['null_counts'] = df.isna().sum().to_dict()
     
     # Check duplicates
     validation_results['duplicate_rows'] = df.duplicated().sum()